@@ -1,8 +1,12 @@
+from collections import defaultdict
 from datetime import date, timedelta
 from sqlalchemy.orm import Session
 
 from app.db.models import BSEEvent
-from app.services.announcement_classifier import classify_announcement
+from app.services.announcement_classifier import (
+    classify_announcements_batch,
+    is_obviously_neutral,
+)
 
 
 def get_event_candidates(
@@ -18,16 +22,32 @@ def get_event_candidates(
         .all()
     )
 
+    # Routine announcements are neutral anyway; don't spend LLM calls on them
+    events = [e for e in events if not is_obviously_neutral(e.headline, e.category)]
+
+    # Classify in per-category batches: prompts within a group share the same
+    # static prefix (instructions + schema + category) for prefix caching
+    events_by_cat = defaultdict(list)
+    for e in events:
+        events_by_cat[e.category].append(e)
+
+    classification_by_id = {}
+    for group in events_by_cat.values():
+        classifications = classify_announcements_batch([
+            {
+                "symbol": e.symbol,
+                "headline": e.headline,
+                "event_date": str(e.event_date),
+                "category": e.category,
+            }
+            for e in group
+        ])
+        for e, ai in zip(group, classifications):
+            classification_by_id[e.id] = ai
+
     results = []
     for e in events:
-        # Classify the announcement using LLM
-        ai = classify_announcement(
-            symbol=e.symbol,
-            headline=e.headline,
-            event_date=str(e.event_date),
-            category=e.category,
-        )
-        
+        ai = classification_by_id[e.id]
         if ai.get("ai_direction") == "neutral":
             continue
 
@@ -1,18 +1,30 @@
+import asyncio
 from json import load
-from typing import Dict, Any
+from typing import Dict, Any, List, Optional
 from typing import Literal
 
 from pydantic import BaseModel, Field
 from langchain_groq import ChatGroq
 from langchain_core.prompts import ChatPromptTemplate
 from langchain_core.output_parsers import JsonOutputParser
+from langchain_core.runnables import RunnableLambda
 
 from app.core.config import settings
 from app.core.logging_utils import get_logger
+from app.core.cache import TTLCache, make_cache_key
+from app.core.http_clients import groq_http_client, groq_http_async_client
 
 # Logger for this module
 logger = get_logger(__name__)
 
+# Explanations are cached for one trading day, keyed on rounded metrics so
+# symbols whose numbers barely moved reuse the previous explanation.
+EXPLANATION_CACHE_TTL = 24 * 60 * 60  # seconds
+_explanation_cache = TTLCache(ttl_seconds=EXPLANATION_CACHE_TTL)
+
+# Rule-neutral candidates below this volume spike skip the LLM entirely
+LOW_CONVICTION_VOL_SPIKE = 1.2
+
 
 # 1) Define the JSON schema we want back from the LLM
 class AICandidateExplanation(BaseModel):
@@ -30,68 +42,55 @@ class AICandidateExplanation(BaseModel):
 parser = JsonOutputParser(pydantic_object=AICandidateExplanation)
 
 # 2) Prompt template
+# Kept deliberately terse: input tokens drive Groq latency/cost, and the
+# static prefix is identical across calls so provider prefix caching can hit.
+# The JSON shape is inlined instead of parser.get_format_instructions().
 prompt = ChatPromptTemplate.from_template(
-    """
-You are an experienced derivatives trader in the Indian market.
-You are given EOD statistics for a single F&O stock and some basic
-rule-based labels. Your job is to form a conservative opinion about
-the directional bias for the NEXT trading session and briefly explain it.
-
-ALWAYS think in terms of probability, NOT certainty.
-If signals are mixed or weak, choose "neutral".
-
-Return ONLY JSON that matches this schema:
-{format_instructions}
-
-Inputs:
-- Symbol: {symbol}
-- Date (EOD data as of): {date}
-- Spot price: {spot}
-- Daily return: {daily_return:.4f} (fraction, e.g. -0.0400 = -4%)
-- ATR%: {atr_pct:.4f}
-- Volume spike vs recent average: {vol_spike:.4f}
-- Gap% vs previous close: {gap_pct:.4f}
-- Total OI near ATM: {total_oi}
-- Total option volume near ATM: {total_volume}
-- Rule-based direction label: {direction}
-- Rule-based strategy hint: {strategy_hint}
-
-Guidelines:
-- If daily_return is strongly positive, vol_spike > 1 and ATR% is not tiny,
-  you may lean "bullish".
-- If daily_return is strongly negative, vol_spike > 1 and ATR% is not tiny,
-  you may lean "bearish".
-- If signals conflict, are small, or OI/volume are low, choose "neutral".
-- Strategy hint should be very short, e.g. "bull call spread near ATM",
-  "buy put near ATM", "no clear trade, wait for better setup", etc.
-- Explanation should mention price move, volume behaviour and OI/liquidity.
-"""
+    """Indian F&O derivatives trader. Give a conservative directional bias for the NEXT session; if signals are mixed, weak or OI/volume is low, say "neutral".
+Stock {symbol} EOD {date}: spot={spot} ret={daily_return:.3f} atr%={atr_pct:.3f} volx={vol_spike:.2f} gap={gap_pct:.3f} oi={total_oi} vol={total_volume} rule={direction} hint={strategy_hint}
+Return ONLY JSON {{"ai_direction":"bullish|bearish|neutral","ai_strategy_hint":"short options strategy","ai_explanation":"2-3 sentences on price move, volume and OI"}}"""
 )
 
-# 3) LLM client (Groq)
-logger.info("Initializing Groq LLM client for AI explainer...")
-llm = ChatGroq(
-    model="llama-3.3-70b-versatile",  # Changed from model_name to model for langchain-core 1.x
+# 3) LLM clients (Groq)
+# The 8B model handles this light structured-output task much faster; the
+# 70B model is only used when the 8B answer fails schema validation.
+# Both models use the process-wide Groq connection pool.
+logger.info("Initializing Groq LLM clients for AI explainer...")
+fast_llm = ChatGroq(
+    model="llama-3.1-8b-instant",
     temperature=0.2,                        # small randomness
     groq_api_key=settings.groq_api_key,
+    http_client=groq_http_client,
+    http_async_client=groq_http_async_client,
+)
+strong_llm = ChatGroq(
+    model="llama-3.3-70b-versatile",  # Changed from model_name to model for langchain-core 1.x
+    temperature=0.2,
+    groq_api_key=settings.groq_api_key,
+    http_client=groq_http_client,
+    http_async_client=groq_http_async_client,
 )
-logger.info("Groq LLM client initialized successfully.")
+logger.info("Groq LLM clients initialized successfully.")
 
-# 4) Full chain: prompt -> LLM -> JSON parser
-chain = prompt | llm | parser
 
+def _validate_explanation(result: Any) -> Dict[str, Any]:
+    """Raise ValidationError if the parsed output doesn't match the schema."""
+    return AICandidateExplanation.model_validate(result).model_dump()
 
-def get_ai_annotation_for_candidate(candidate: Dict[str, Any]) -> Dict[str, Any]:
+
+# 4) Full chain: prompt -> LLM -> JSON parser -> schema check,
+#    8B first with 70B fallback
+fast_chain = prompt | fast_llm | parser | RunnableLambda(_validate_explanation)
+strong_chain = prompt | strong_llm | parser | RunnableLambda(_validate_explanation)
+chain = fast_chain.with_fallbacks([strong_chain])
+
+
+def _build_payload(candidate: Dict[str, Any]) -> Dict[str, Any]:
     """
-    Take one candidate dict (from your existing scoring pipeline)
-    and return the parsed AI explanation as a plain dict.
+    Build the prompt input dict for one candidate (with defensive defaults).
     """
-    symbol = candidate.get("symbol")
-    logger.info(f"Generating AI annotation for symbol={symbol}")
-
-    # Defensive defaults
-    payload = {
-        "symbol": symbol,
+    return {
+        "symbol": candidate.get("symbol"),
         "date": str(candidate.get("date")),
         "spot": float(candidate.get("spot") or 0),
         "daily_return": float(
@@ -104,18 +103,45 @@ def get_ai_annotation_for_candidate(candidate: Dict[str, Any]) -> Dict[str, Any]
         "total_volume": float(candidate.get("total_volume") or 0.0),
         "direction": candidate.get("direction") or "neutral",
         "strategy_hint": candidate.get("strategy_hint") or "",
-        "format_instructions": parser.get_format_instructions(),
     }
 
-    logger.debug(f"AI payload for {symbol}: {payload}")
 
-    try:
-        result: AICandidateExplanation = chain.invoke(payload)
-        logger.info(f"AI annotation received for symbol={symbol}")
-    except Exception as e:
-        logger.exception(f"Error while invoking AI chain for symbol={symbol}: {e}")
-        raise
+def _explanation_cache_key(payload: Dict[str, Any]) -> str:
+    """
+    Normalized payload key; used both for the cross-request cache and to
+    dedupe identical payloads within one batch.
+    """
+    return make_cache_key(
+        payload["symbol"],
+        round(payload["daily_return"], 3),
+        round(payload["vol_spike"], 2),
+        round(payload["atr_pct"], 3),
+        payload["direction"],
+    )
+
+
+def _precomputed_annotation(payload: Dict[str, Any]) -> Optional[Dict[str, Any]]:
+    """
+    Return an annotation without calling the LLM when possible:
+    - rule-based neutral with no volume interest -> the LLM would just echo
+      "neutral", so answer synthetically
+    - otherwise a cached explanation, if any
+    """
+    if payload["direction"] == "neutral" and payload["vol_spike"] < LOW_CONVICTION_VOL_SPIKE:
+        return {
+            "ai_direction": "neutral",
+            "ai_strategy_hint": payload["strategy_hint"],
+            "ai_explanation": "Low conviction; rule-based neutral.",
+        }
+
+    cached = _explanation_cache.get(_explanation_cache_key(payload))
+    return dict(cached) if cached is not None else None
 
+
+def _result_to_dict(result: Any, symbol: Optional[str]) -> Dict[str, Any]:
+    """
+    Normalize whatever the chain returned into a plain dict.
+    """
     # Convert Pydantic model → dict
     if isinstance(result, dict):
         logger.debug(f"AI result (dict) for {symbol}: {result}")
@@ -142,3 +168,53 @@ def get_ai_annotation_for_candidate(candidate: Dict[str, Any]) -> Dict[str, Any]
                 "explanation": str(result),
                 "strategy_hint": None,
             }
+
+
+async def aget_ai_annotation_for_candidate(candidate: Dict[str, Any]) -> Dict[str, Any]:
+    """
+    Take one candidate dict (from your existing scoring pipeline) and return
+    the parsed AI explanation as a plain dict. Async (chain.ainvoke), so
+    FastAPI handlers don't block a worker thread on the Groq round-trip.
+    """
+    symbol = candidate.get("symbol")
+    logger.info(f"Generating AI annotation for symbol={symbol}")
+
+    payload = _build_payload(candidate)
+    logger.debug(f"AI payload for {symbol}: {payload}")
+
+    precomputed = _precomputed_annotation(payload)
+    if precomputed is not None:
+        logger.info(f"AI annotation served without LLM call for symbol={symbol}")
+        return precomputed
+
+    try:
+        result: AICandidateExplanation = await chain.ainvoke(payload)
+        logger.info(f"AI annotation received for symbol={symbol}")
+    except Exception as e:
+        logger.exception(f"Error while invoking AI chain for symbol={symbol}: {e}")
+        raise
+
+    result_dict = _result_to_dict(result, symbol)
+    _explanation_cache.set(_explanation_cache_key(payload), dict(result_dict))
+    return result_dict
+
+
+async def aget_ai_annotations_for_candidates(
+    candidates: List[Dict[str, Any]],
+) -> List[Dict[str, Any]]:
+    """
+    Annotate all candidates concurrently with asyncio.gather.
+    Candidates with identical normalized payloads share one LLM call.
+    Results are returned in the same order as the input candidates.
+    """
+    keys = [_explanation_cache_key(_build_payload(c)) for c in candidates]
+
+    unique: Dict[str, Dict[str, Any]] = {}
+    for key, c in zip(keys, candidates):
+        unique.setdefault(key, c)
+
+    results = await asyncio.gather(
+        *(aget_ai_annotation_for_candidate(c) for c in unique.values())
+    )
+    by_key = dict(zip(unique.keys(), results))
+    return [dict(by_key[key]) for key in keys]
@@ -1,7 +1,10 @@
+import asyncio
 from datetime import date
-from typing import List
+from typing import List, Dict, Any
 
 from fastapi import APIRouter, Depends, Query
+from fastapi.concurrency import run_in_threadpool
+from fastapi.responses import ORJSONResponse, StreamingResponse
 from sqlalchemy.orm import Session
 
 from app.candidate.candidate_access import get_top_candidates_for_date
@@ -9,17 +12,29 @@ from app.candidate.candidate_validator import CandidateOut
 from app.db.sessions import get_db
 from app.ai.ai_access import get_event_candidates
 from app.core.logging_utils import get_logger
-from .ai_explainer import get_ai_annotation_for_candidate
+from .ai_explainer import (
+    aget_ai_annotation_for_candidate,
+    aget_ai_annotations_for_candidates,
+)
 
 router = APIRouter(
     prefix="/candidates",
     tags=["candidates-ai"],
+    default_response_class=ORJSONResponse,
 )
 logger = get_logger(__name__)
 
 
+def _apply_ai(r: Dict[str, Any], ai: Dict[str, Any]) -> Dict[str, Any]:
+    """Merge an AI annotation into a candidate dict."""
+    r["ai_direction"] = ai["ai_direction"]
+    r["ai_strategy_hint"] = ai["ai_strategy_hint"]
+    r["ai_explanation"] = ai["ai_explanation"]
+    return r
+
+
 @router.get("/ai", response_model=List[CandidateOut])
-def list_candidates_with_ai(
+async def list_candidates_with_ai(
     target_date: date = Query(..., alias="date"),
     limit: int = Query(10, ge=1, le=50),
     min_oi: float = Query(0.0, ge=0.0),
@@ -30,48 +45,59 @@ def list_candidates_with_ai(
     Same as /candidates, but additionally calls the LLM (Groq)
     to add ai_direction, ai_strategy_hint, ai_explanation.
 
-    NOTE: This will make 1 LLM call per candidate (limit),
-    so keep 'limit' modest (e.g. 5–10).
+    NOTE: This makes up to 1 LLM call per candidate (limit), dispatched
+    concurrently in one batch, so keep 'limit' modest (e.g. 5–10).
     """
-    base = get_top_candidates_for_date(
-        db, target_date, limit=limit, min_oi=min_oi, min_volume=min_volume
+    # DB scan is sync; keep it off the event loop
+    base = await run_in_threadpool(
+        get_top_candidates_for_date,
+        db, target_date, limit=limit, min_oi=min_oi, min_volume=min_volume,
     )
 
-    enriched = []
-    for r in base:
-        ai = get_ai_annotation_for_candidate(r)
-        r["ai_direction"] = ai["ai_direction"]
-        r["ai_strategy_hint"] = ai["ai_strategy_hint"]
-        r["ai_explanation"] = ai["ai_explanation"]
-        enriched.append(r)
-
-    # Reuse CandidateOut but we need to extend it a bit (next step)
-    result: List[CandidateOut] = []
-    for r in enriched:
-        result.append(
-            CandidateOut(
-                symbol=r["symbol"],
-                date=r["date"],
-                score=r["score"],
-                atr_pct=r.get("atr_pct", 0.0),
-                vol_spike=r.get("vol_spike", 0.0),
-                gap_pct=r.get("gap_pct", 0.0),
-                daily_return=r.get("return", 0.0),
-                spot=r.get("spot"),
-                expiry=r.get("expiry"),
-                total_oi=r.get("total_oi"),
-                total_volume=r.get("total_volume"),
-                direction=r.get("direction"),
-                strategy_hint=r.get("strategy_hint"),
-                ai_direction=r.get("ai_direction"),
-                ai_strategy_hint=r.get("ai_strategy_hint"),
-                ai_explanation=r.get("ai_explanation"),
-            )
-        )
+    ai_results = await aget_ai_annotations_for_candidates(base)
+
+    enriched = [_apply_ai(r, ai) for r, ai in zip(base, ai_results)]
+
+    result: List[CandidateOut] = [CandidateOut.from_candidate(r) for r in enriched]
 
     return result
 
 
+@router.get("/ai/stream")
+async def stream_candidates_with_ai(
+    target_date: date = Query(..., alias="date"),
+    limit: int = Query(10, ge=1, le=50),
+    min_oi: float = Query(0.0, ge=0.0),
+    min_volume: float = Query(0.0, ge=0.0),
+    db: Session = Depends(get_db),
+):
+    """
+    Streaming variant of /candidates/ai.
+
+    Emits one CandidateOut JSON object per line (NDJSON) as soon as its
+    LLM annotation completes, so rows arrive in completion order rather
+    than score order. Use /candidates/ai when you need an ordered array.
+    """
+    base = await run_in_threadpool(
+        get_top_candidates_for_date,
+        db, target_date, limit=limit, min_oi=min_oi, min_volume=min_volume,
+    )
+
+    async def _annotate(r: Dict[str, Any]) -> Dict[str, Any]:
+        return _apply_ai(r, await aget_ai_annotation_for_candidate(r))
+
+    async def _rows():
+        for next_done in asyncio.as_completed([_annotate(r) for r in base]):
+            try:
+                r = await next_done
+            except Exception as e:
+                logger.error("Skipping candidate in AI stream: %s", e)
+                continue
+            yield CandidateOut.from_candidate(r).model_dump_json().encode() + b"\n"
+
+    return StreamingResponse(_rows(), media_type="application/x-ndjson")
+
+
 @router.get("/candidates")
 def event_candidates(
     window_days: int = Query(7, ge=1, le=30),
@@ -1,5 +1,5 @@
 from pydantic import BaseModel
-from typing import Literal
+from typing import List, Literal
 
 class AIEventImpact(BaseModel):
     event_type: Literal[
@@ -15,3 +15,7 @@ class AIEventImpact(BaseModel):
     reaction_window: Literal["same_day", "next_day", "1_3_days"]
     confidence: Literal["low", "medium", "high"]
     explanation: str
+
+
+class BatchAIEventImpact(BaseModel):
+    results: List[AIEventImpact]
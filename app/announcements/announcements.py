@@ -5,6 +5,7 @@ from datetime import date
 from typing import List, Dict, Any
 
 from fastapi import APIRouter, Depends, Query, HTTPException
+from fastapi.concurrency import run_in_threadpool
 from sqlalchemy.orm import Session
 from pydantic import BaseModel
 
@@ -36,7 +37,7 @@ class PipelineResponse(BaseModel):
 
 
 @router.post("/run-pipeline", response_model=PipelineResponse)
-def run_pipeline(
+async def run_pipeline(
     target_date: date = Query(None, description="Date to process (defaults to today)"),
     db: Session = Depends(get_db),
 ):
@@ -48,7 +49,11 @@ def run_pipeline(
     4. Return trade-ready recommendations
     """
     try:
-        result = run_daily_announcement_pipeline(db=db, target_date=target_date)
+        # The pipeline (scrape + LLM + DB) is sync; run it in a worker thread
+        # so it doesn't block the event loop for other requests
+        result = await run_in_threadpool(
+            run_daily_announcement_pipeline, db=db, target_date=target_date
+        )
         
         # Format trade recommendations
         trade_recs = []
@@ -2,6 +2,7 @@ from datetime import date
 from typing import List
 
 from fastapi import APIRouter, Depends, Query
+from fastapi.responses import ORJSONResponse
 from sqlalchemy.orm import Session
 
 from app.candidate.candidate_access import get_top_candidates_for_date
@@ -12,6 +13,7 @@ from app.core.logging_utils import get_logger
 router = APIRouter(
     prefix="/candidates",
     tags=["candidates"],
+    default_response_class=ORJSONResponse,
 )
 logger = get_logger(__name__)
 
@@ -47,27 +49,9 @@ def list_candidates(
 
     logger.info(f"Fetched {len(raw_results)} raw candidates for {target_date}")
 
-    candidates: List[CandidateOut] = []
-    for r in raw_results:
-        logger.debug(f"Parsing candidate symbol={r.get('symbol')}")
-
-        candidates.append(
-            CandidateOut(
-                symbol=r.get("symbol"),
-                date=r.get("date"),
-                score=r.get("score"),
-                atr_pct=r.get("atr_pct", 0.0),
-                vol_spike=r.get("vol_spike", 0.0),
-                gap_pct=r.get("gap_pct", 0.0),
-                daily_return=r.get("return", 0.0),
-                spot=r.get("spot"),
-                expiry=r.get("expiry"),
-                total_oi=r.get("total_oi"),
-                total_volume=r.get("total_volume"),
-                direction=r.get("direction"),
-                strategy_hint=r.get("strategy_hint"),
-            )
-        )
+    candidates: List[CandidateOut] = [
+        CandidateOut.from_candidate(r) for r in raw_results
+    ]
 
     logger.info(f"Returning {len(candidates)} candidates for {target_date}")
     return candidates
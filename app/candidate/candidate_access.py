@@ -1,15 +1,32 @@
+import bisect
 from datetime import date
 from typing import List, Dict, Any, Tuple, Optional
 
+import numpy as np
 from sqlalchemy.orm import Session
-from sqlalchemy import text
+from sqlalchemy import select
 
+from app.db.models import DailyPrice
 from app.services.signals import score_all_symbols_for_date
-from app.services.options import get_options_liquidity
+from app.services.options import get_options_liquidity_bulk
 from app.core.logging_utils import get_logger
+from app.core.cache import TTLCache
 
 logger = get_logger(__name__)
 
+TRADING_DATES_CACHE_TTL = 60 * 60  # seconds
+_trading_dates_cache = TTLCache(ttl_seconds=TRADING_DATES_CACHE_TTL, maxsize=1)
+
+
+# Strategy hints produced by the rule-based classifier
+STRATEGY_BUY_CALL = "buy near-ATM call; avoid very far OTM strikes"
+STRATEGY_BULL_CALL_SPREAD = "bull call spread (buy near-ATM call, sell higher strike)"
+STRATEGY_BUY_PUT = "buy near-ATM put; avoid very far OTM strikes"
+STRATEGY_BEAR_PUT_SPREAD = "bear put spread (buy near-ATM put, sell lower strike)"
+STRATEGY_QUIET = "very quiet; probably skip or trade only if intraday setup is clean"
+STRATEGY_RANGE_BOUND = "range-bound options (iron condor / short strangle) if experienced"
+STRATEGY_NO_VIEW = "no strong view; consider skipping"
+
 
 def classify_direction_and_strategy(metrics: Dict[str, Any]) -> Tuple[str, str]:
     """
@@ -29,28 +46,26 @@ def classify_direction_and_strategy(metrics: Dict[str, Any]) -> Tuple[str, str]:
     if ret >= 0.03 and vol_spike >= 1.3 and gap > -0.01:
         direction = "bullish"
         if atr_pct < 0.04:
-            strategy = "buy near-ATM call; avoid very far OTM strikes"
+            strategy = STRATEGY_BUY_CALL
         else:
-            strategy = "bull call spread (buy near-ATM call, sell higher strike)"
+            strategy = STRATEGY_BULL_CALL_SPREAD
 
     # Bearish
     elif ret <= -0.03 and vol_spike >= 1.3:
         direction = "bearish"
         if atr_pct < 0.04:
-            strategy = "buy near-ATM put; avoid very far OTM strikes"
+            strategy = STRATEGY_BUY_PUT
         else:
-            strategy = "bear put spread (buy near-ATM put, sell lower strike)"
+            strategy = STRATEGY_BEAR_PUT_SPREAD
 
     # Neutral
     else:
         if abs(ret) < 0.01 and vol_spike < 1.2:
-            strategy = "very quiet; probably skip or trade only if intraday setup is clean"
+            strategy = STRATEGY_QUIET
         elif atr_pct >= 0.03:
-            strategy = (
-                "range-bound options (iron condor / short strangle) if experienced"
-            )
+            strategy = STRATEGY_RANGE_BOUND
         else:
-            strategy = "no strong view; consider skipping"
+            strategy = STRATEGY_NO_VIEW
 
     logger.debug(
         f"Classified {metrics.get('symbol')} as direction={direction}, strategy={strategy}"
@@ -58,19 +73,80 @@ def classify_direction_and_strategy(metrics: Dict[str, Any]) -> Tuple[str, str]:
     return direction, strategy
 
 
+def classify_directions_and_strategies(rows: List[Dict[str, Any]]) -> None:
+    """
+    Vectorized classify_direction_and_strategy over many metric dicts.
+    Same rules, evaluated with NumPy masks; writes "direction" and
+    "strategy_hint" into each row in place.
+    """
+    n = len(rows)
+    if n == 0:
+        return
+
+    def _col(key: str) -> np.ndarray:
+        return np.fromiter((r.get(key) or 0.0 for r in rows), dtype=float, count=n)
+
+    ret = _col("return")
+    vol_spike = _col("vol_spike")
+    gap = _col("gap_pct")
+    atr_pct = _col("atr_pct")
+
+    bullish = (ret >= 0.03) & (vol_spike >= 1.3) & (gap > -0.01)
+    bearish = ~bullish & (ret <= -0.03) & (vol_spike >= 1.3)
+    low_atr = atr_pct < 0.04
+    quiet = (np.abs(ret) < 0.01) & (vol_spike < 1.2)
+
+    directions = np.select([bullish, bearish], ["bullish", "bearish"], "neutral")
+    strategies = np.select(
+        [
+            bullish & low_atr,
+            bullish,
+            bearish & low_atr,
+            bearish,
+            quiet,
+            atr_pct >= 0.03,
+        ],
+        [
+            STRATEGY_BUY_CALL,
+            STRATEGY_BULL_CALL_SPREAD,
+            STRATEGY_BUY_PUT,
+            STRATEGY_BEAR_PUT_SPREAD,
+            STRATEGY_QUIET,
+            STRATEGY_RANGE_BOUND,
+        ],
+        STRATEGY_NO_VIEW,
+    )
+
+    for r, direction, strategy in zip(rows, directions.tolist(), strategies.tolist()):
+        r["direction"] = direction
+        r["strategy_hint"] = strategy
+
+
+def _get_trading_dates(db: Session) -> List[date]:
+    """
+    Return the sorted list of distinct trade dates in daily_prices.
+    The set only changes at EOD ingestion, so it is cached in process for
+    TRADING_DATES_CACHE_TTL seconds (and keyed by today's date so it also
+    refreshes at midnight); no DB round-trip on a cache hit.
+    """
+    cache_key = date.today().isoformat()
+    dates = _trading_dates_cache.get(cache_key)
+    if dates is None:
+        stmt = select(DailyPrice.date).distinct().order_by(DailyPrice.date)
+        dates = list(db.scalars(stmt))
+        _trading_dates_cache.set(cache_key, dates)
+    return dates
+
+
 def _get_last_trade_date(db: Session, target_date: date) -> Optional[date]:
     """
     Return the most recent trade date <= target_date found in daily_prices.
     Returns None if none exists (DB empty / too early).
     """
-    # Use a safe raw SQL scalar query for the max date
     try:
-        sql = text("SELECT MAX(date) FROM daily_prices WHERE date <= :d")
-        res = db.execute(sql, {"d": target_date}).scalar_one_or_none()
-        if res is None:
-            return None
-        # SQL may return datetime.date already; ensure type correctness
-        return res
+        dates = _get_trading_dates(db)
+        idx = bisect.bisect_right(dates, target_date) - 1
+        return dates[idx] if idx >= 0 else None
     except Exception as e:
         logger.exception("Error fetching last trade date up to %s: %s", target_date, e)
         return None
@@ -88,7 +164,7 @@ def get_top_candidates_for_date(
     2) Compute options liquidity (with moneyness fallbacks)
     3) Filter by min OI/volume
     4) Add direction + strategy
-    5) Return sorted list
+    5) Return top 'limit' by score (scoring output is already sorted)
 
     NOTE: If the requested target_date has no trades, we fallback to the last
     available trading date <= target_date.
@@ -125,32 +201,40 @@ def get_top_candidates_for_date(
     filtered: List[Dict[str, Any]] = []
     skip_reasons: Dict[str, str] = {}
 
-    # Step 2: Options liquidity for each symbol with moneyness fallbacks
+    # Step 2: Options liquidity for all symbols with moneyness fallbacks.
+    # One bulk query per band; each band only retries symbols still missing.
+    bands = (0.05, 0.1, 0.2, 0.5)
+    pending = {r.get("symbol") for r in base_results if r.get("symbol")}
+    liq_map: Dict[str, Dict[str, Any]] = {}
+    for band in bands:
+        if not pending:
+            break
+        try:
+            found = get_options_liquidity_bulk(
+                db, list(pending), target_date, moneyness_band=band
+            )
+        except Exception as e:
+            logger.warning("Bulk liquidity fetch error at band %s: %s", band, e)
+            continue
+
+        logger.debug("Found liquidity for %d symbols at moneyness band %s", len(found), band)
+        liq_map.update(found)
+        pending.difference_update(found)
+
+    # base_results is already sorted by score (highest first) and the loop
+    # preserves that order, so stop as soon as we have 'limit' survivors
     for r in base_results:
+        if len(filtered) >= limit:
+            break
+
         symbol = r.get("symbol")
         if not symbol:
             logger.debug("Skipping entry without symbol in scoring results.")
             continue
 
-        logger.debug(f"Checking options liquidity for {symbol} at date={target_date}...")
-
-        # Try a list of increasing moneyness bands until we find liquidity
-        liq = None
-        tried_bands = []
-        for band in (0.05, 0.1, 0.2, 0.5):
-            tried_bands.append(band)
-            try:
-                liq = get_options_liquidity(db, symbol, target_date, moneyness_band=band)
-            except Exception as e:
-                logger.warning("Liquidity fetch error for %s at band %s: %s", symbol, band, e)
-                liq = None
-
-            if liq:
-                logger.debug("Found liquidity for %s at moneyness band %s", symbol, band)
-                break
-
+        liq = liq_map.get(symbol)
         if not liq:
-            skip_reasons[symbol] = f"no_liquidity_at_bands:{tried_bands}"
+            skip_reasons[symbol] = f"no_liquidity_at_bands:{list(bands)}"
             logger.debug("%s skipped: %s", symbol, skip_reasons[symbol])
             continue
 
@@ -164,21 +248,20 @@ def get_top_candidates_for_date(
             logger.debug("%s skipped: %s", symbol, skip_reasons[symbol])
             continue
 
-        # Merge liquidity info into result dict
+        # Merge liquidity info into result dict (keys match CandidateOut)
+        r["daily_return"] = r.get("return", 0.0)
         r["spot"] = liq.get("spot")
         r["expiry"] = liq.get("expiry")
         r["total_oi"] = total_oi
         r["total_volume"] = total_volume
 
-        # Step 3: Apply rule-based direction
-        direction, strategy = classify_direction_and_strategy(r)
-        r["direction"] = direction
-        r["strategy_hint"] = strategy
-
         filtered.append(r)
 
+    # Step 3: Apply rule-based direction to all survivors in one pass
+    classify_directions_and_strategies(filtered)
+
     logger.info(
-        "After liquidity and rule filters, %s candidates remain before sorting (date=%s).",
+        "After liquidity and rule filters, %s candidates remain (date=%s).",
         len(filtered),
         target_date,
     )
@@ -188,10 +271,8 @@ def get_top_candidates_for_date(
         sample = ", ".join(f"{k}:{v}" for k, v in list(skip_reasons.items())[:10])
         logger.info("Skipped symbols summary (sample): %s", sample)
 
-    # Step 4: Sort by score descending
-    filtered.sort(key=lambda x: x.get("score", 0.0), reverse=True)
-
-    final = filtered[:limit]
+    # Step 4: Already in score-descending order and capped at 'limit'
+    final = filtered
     logger.info(f"Returning top {len(final)} candidates for {target_date}")
 
     return final
@@ -1,5 +1,5 @@
 from datetime import date as date_type
-from typing import Optional
+from typing import Optional, Dict, Any
 from pydantic import BaseModel
 
 
@@ -27,3 +27,14 @@ class CandidateOut(BaseModel):
 
     class Config:
         from_attributes = True
+
+    @classmethod
+    def from_candidate(cls, r: Dict[str, Any]) -> "CandidateOut":
+        """
+        Build from a candidate dict produced by get_top_candidates_for_date,
+        whose keys already match the field names. The data is internal and
+        already typed, so skip validation via model_construct.
+        """
+        return cls.model_construct(
+            **{name: r[name] for name in cls.model_fields if name in r}
+        )
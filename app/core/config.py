@@ -6,6 +6,11 @@ class Settings(BaseSettings):
     database_url: str
     groq_api_key: Optional[str] = None
     gnews_api_key: Optional[str] = None
+    # Concurrent Groq calls; raise on paid tiers with higher RPM limits
+    groq_max_concurrency: int = 5
+    # Groq per-minute budgets for the classification model (free tier defaults)
+    groq_rpm_limit: int = 30
+    groq_tpm_limit: int = 12000
 
     class Config:
         env_file = ".env"
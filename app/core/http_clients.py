@@ -0,0 +1,24 @@
+"""
+Process-wide HTTP clients for Groq.
+"""
+import atexit
+
+import httpx
+
+# All LLM modules talk to the same Groq host, so they share one pre-warmed
+# connection pool sized for the batched/async fan-out (httpx defaults are
+# too small and would force fresh TLS handshakes).
+GROQ_HTTP_LIMITS = httpx.Limits(
+    max_connections=64,
+    max_keepalive_connections=32,
+    keepalive_expiry=60,
+)
+GROQ_HTTP_TIMEOUT = httpx.Timeout(30.0, connect=5.0)
+
+groq_http_client = httpx.Client(limits=GROQ_HTTP_LIMITS, timeout=GROQ_HTTP_TIMEOUT)
+groq_http_async_client = httpx.AsyncClient(limits=GROQ_HTTP_LIMITS, timeout=GROQ_HTTP_TIMEOUT)
+
+# The async client's connections belong to the app's event loop, so it is
+# only awaited on that loop and closed by the app's shutdown hook (main.py);
+# code that starts its own loops (asyncio.run) opens its own client instead
+atexit.register(groq_http_client.close)
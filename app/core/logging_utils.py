@@ -7,9 +7,9 @@ LOG_FORMAT = "%(asctime)s - %(levelname)s - %(name)s - %(message)s"
 # Ensure logs directory exists for future use (optional)
 os.makedirs("logs", exist_ok=True)
 
-# Configure root logger
+# Configure root logger; LOG_LEVEL=WARNING in production drops per-request chatter
 logging.basicConfig(
-    level=logging.INFO,
+    level=os.getenv("LOG_LEVEL", "INFO").upper(),
     format=LOG_FORMAT,
 )
 
@@ -1,7 +1,8 @@
 # app/db/init_db.py
 
-from sqlalchemy.orm import Session
 from sqlalchemy import select
+from sqlalchemy.engine import Connection
+from sqlalchemy.dialects.postgresql import insert as pg_insert
 
 from app.db.sessions import engine, Base
 # Import all models so SQLAlchemy knows about them when creating tables
@@ -18,32 +19,28 @@ from app.db.models import (
 from app.services.universe import get_fno_universe
 
 
-def seed_stocks(db: Session):
-    """Insert F&O universe into stocks table if not present."""
-    df = get_fno_universe()
+def seed_stocks(conn: Connection):
+    """
+    Insert F&O universe into stocks table if not present.
 
-    existing_symbols = {
-        s[0]
-        for s in db.execute(select(Stock.symbol))
-    }
+    Runs on the caller's connection and does not commit: the existence check
+    and the bulk insert share the caller's single transaction
+    (``with engine.begin() as conn``), so the whole seed is one commit.
+    """
+    df = get_fno_universe()
 
-    new_rows = []
-    for _, row in df.iterrows():
-        symbol = row["symbol"]
-        if symbol in existing_symbols:
-            continue
+    existing_symbols = set(conn.scalars(select(Stock.symbol)))
 
-        stock = Stock(
-            symbol=symbol,
-            name=row.get("name"),
-            segment=row.get("segment"),
-        )
-        new_rows.append(stock)
+    # Vectorized filter instead of a per-row membership loop
+    new_df = df.loc[~df["symbol"].isin(existing_symbols), ["symbol", "name", "segment"]]
+    new_df = new_df.drop_duplicates(subset="symbol")
+    records = new_df.astype(object).where(new_df.notna(), None).to_dict("records")
 
-    if new_rows:
-        db.add_all(new_rows)
-        db.commit()
-        print(f"Inserted {len(new_rows)} stocks into 'stocks' table.")
+    if records:
+        # One multi-VALUES Core insert; ON CONFLICT covers concurrent seeders
+        stmt = pg_insert(Stock).on_conflict_do_nothing(index_elements=["symbol"])
+        conn.execute(stmt, records)
+        print(f"Inserted {len(records)} stocks into 'stocks' table.")
     else:
         print("No new stocks to insert; already up to date.")
 
@@ -54,12 +51,6 @@ def init_db():
     print("Creating tables (if not exist)...")
     Base.metadata.create_all(bind=engine)
 
-    # 2) Seed data
-    from sqlalchemy.orm import sessionmaker
-
-    SessionLocal = sessionmaker(bind=engine, autoflush=False, autocommit=False)
-    db = SessionLocal()
-    try:
-        seed_stocks(db)
-    finally:
-        db.close()
+    # 2) Seed data in one transaction
+    with engine.begin() as conn:
+        seed_stocks(conn)
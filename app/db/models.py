@@ -1,6 +1,7 @@
+import datetime
+from typing import Any, List, Optional
+
 from sqlalchemy import (
-    Column,
-    Integer,
     String,
     Float,
     Date,
@@ -13,45 +14,47 @@ from sqlalchemy import (
     Text
 )
 from sqlalchemy.sql import func
-from sqlalchemy.orm import relationship
+from sqlalchemy.orm import Mapped, mapped_column, relationship
 
 from app.db.sessions import Base
 
 class ProcessedRun(Base):
     __tablename__ = "processed_runs"
 
-    id = Column(Integer, primary_key=True, autoincrement=True)
-    run_date = Column(Date, nullable=False, unique=True)  # trading date that was ingested
-    source = Column(String, nullable=False)  # e.g., "equity", "fno", "both"
-    created_at = Column(Date, server_default=func.now())
+    id: Mapped[int] = mapped_column(primary_key=True, autoincrement=True)
+    run_date: Mapped[datetime.date] = mapped_column(Date, unique=True)  # trading date that was ingested
+    source: Mapped[str] = mapped_column(String)  # e.g., "equity", "fno", "both"
+    created_at: Mapped[Optional[datetime.date]] = mapped_column(Date, server_default=func.now())
 
 class Stock(Base):
     __tablename__ = "stocks"
 
-    id = Column(Integer, primary_key=True, index=True)
-    symbol = Column(String(32), unique=True, index=True, nullable=False)
-    name = Column(String(255), nullable=True)
-    segment = Column(String(32), nullable=True)  # e.g. EQ
+    id: Mapped[int] = mapped_column(primary_key=True, index=True)
+    symbol: Mapped[str] = mapped_column(String(32), unique=True, index=True)
+    name: Mapped[Optional[str]] = mapped_column(String(255))
+    segment: Mapped[Optional[str]] = mapped_column(String(32))  # e.g. EQ
 
     # relationships if needed later
-    prices = relationship("DailyPrice", back_populates="stock", cascade="all, delete-orphan")
-    options = relationship("OptionChain", back_populates="stock", cascade="all, delete-orphan")
+    prices: Mapped[List["DailyPrice"]] = relationship(back_populates="stock", cascade="all, delete-orphan")
+    options: Mapped[List["OptionChain"]] = relationship(back_populates="stock", cascade="all, delete-orphan")
 
 
 class DailyPrice(Base):
     __tablename__ = "daily_prices"
 
-    id = Column(Integer, primary_key=True)
-    symbol = Column(String(32), ForeignKey("stocks.symbol"), index=True, nullable=False)
-    date = Column(Date, index=True, nullable=False)
+    id: Mapped[int] = mapped_column(primary_key=True)
+    symbol: Mapped[str] = mapped_column(String(32), ForeignKey("stocks.symbol"), index=True)
+    date: Mapped[datetime.date] = mapped_column(Date, index=True)
 
-    open = Column(Float, nullable=False)
-    high = Column(Float, nullable=False)
-    low = Column(Float, nullable=False)
-    close = Column(Float, nullable=False)
-    volume = Column(Float, nullable=True)  # can be big, keep as float
+    open: Mapped[float] = mapped_column(Float)
+    high: Mapped[float] = mapped_column(Float)
+    low: Mapped[float] = mapped_column(Float)
+    close: Mapped[float] = mapped_column(Float)
+    volume: Mapped[Optional[float]] = mapped_column(Float)  # can be big, keep as float
 
-    stock = relationship("Stock", back_populates="prices")
+    # lazy="raise": load explicitly with selectinload(DailyPrice.stock) instead
+    # of one lazy SELECT per row
+    stock: Mapped["Stock"] = relationship(back_populates="prices", lazy="raise")
 
     __table_args__ = (
         UniqueConstraint("symbol", "date", name="uq_daily_price_symbol_date"),
@@ -62,20 +65,20 @@ class DailyPrice(Base):
 class OptionChain(Base):
     __tablename__ = "option_chain"
 
-    id = Column(Integer, primary_key=True)
-    symbol = Column(String(32), ForeignKey("stocks.symbol"), index=True, nullable=False)
-    date = Column(Date, index=True, nullable=False)
+    id: Mapped[int] = mapped_column(primary_key=True)
+    symbol: Mapped[str] = mapped_column(String(32), ForeignKey("stocks.symbol"), index=True)
+    date: Mapped[datetime.date] = mapped_column(Date, index=True)
 
-    expiry = Column(Date, index=True, nullable=False)
-    strike = Column(Float, index=True, nullable=False)
-    option_type = Column(String(2), nullable=False)  # 'CE' or 'PE'
+    expiry: Mapped[datetime.date] = mapped_column(Date, index=True)
+    strike: Mapped[float] = mapped_column(Float, index=True)
+    option_type: Mapped[str] = mapped_column(String(2))  # 'CE' or 'PE'
 
-    ltp = Column(Float, nullable=True)   # last traded price
-    iv = Column(Float, nullable=True)    # implied volatility
-    oi = Column(Float, nullable=True)    # open interest
-    volume = Column(Float, nullable=True)
+    ltp: Mapped[Optional[float]] = mapped_column(Float)   # last traded price
+    iv: Mapped[Optional[float]] = mapped_column(Float)    # implied volatility
+    oi: Mapped[Optional[float]] = mapped_column(Float)    # open interest
+    volume: Mapped[Optional[float]] = mapped_column(Float)
 
-    stock = relationship("Stock", back_populates="options")
+    stock: Mapped["Stock"] = relationship(back_populates="options", lazy="raise")
 
     __table_args__ = (
         Index("ix_option_chain_symbol_date_expiry", "symbol", "date", "expiry"),
@@ -85,16 +88,16 @@ class OptionChain(Base):
 class News(Base):
     __tablename__ = "news"
 
-    id = Column(Integer, primary_key=True)
-    symbol = Column(String(32), ForeignKey("stocks.symbol"), index=True, nullable=False)
+    id: Mapped[int] = mapped_column(primary_key=True)
+    symbol: Mapped[str] = mapped_column(String(32), ForeignKey("stocks.symbol"), index=True)
 
-    published_at = Column(DateTime, index=True, nullable=False)
-    source = Column(String(128), nullable=True)
-    headline = Column(String(512), nullable=False)
-    snippet = Column(String(1024), nullable=True)
-    url = Column(String(1024), nullable=True)
+    published_at: Mapped[datetime.datetime] = mapped_column(DateTime, index=True)
+    source: Mapped[Optional[str]] = mapped_column(String(128))
+    headline: Mapped[str] = mapped_column(Text)
+    snippet: Mapped[Optional[str]] = mapped_column(Text)
+    url: Mapped[Optional[str]] = mapped_column(Text)
 
-    stock = relationship("Stock")
+    stock: Mapped["Stock"] = relationship(lazy="raise")
 
     __table_args__ = (
         Index("ix_news_symbol_published_at", "symbol", "published_at"),
@@ -104,22 +107,22 @@ class News(Base):
 class NewsImpact(Base):
     __tablename__ = "news_impact"
 
-    id = Column(Integer, primary_key=True)
-    symbol = Column(String(32), ForeignKey("stocks.symbol"), index=True, nullable=False)
-    date = Column(Date, index=True, nullable=False)
+    id: Mapped[int] = mapped_column(primary_key=True)
+    symbol: Mapped[str] = mapped_column(String(32), ForeignKey("stocks.symbol"), index=True)
+    date: Mapped[datetime.date] = mapped_column(Date, index=True)
 
     # e.g. strongly_positive, mildly_positive, neutral, mildly_negative, strongly_negative
-    sentiment = Column(String(32), nullable=False)
+    sentiment: Mapped[str] = mapped_column(String(32))
 
     # e.g. low, medium, high
-    impact = Column(String(16), nullable=False)
+    impact: Mapped[str] = mapped_column(String(16))
 
     # list of event types, we’ll store as JSON array of strings
-    event_types = Column(JSON, nullable=True)
+    event_types: Mapped[Optional[Any]] = mapped_column(JSON)
 
-    summary = Column(String(1024), nullable=True)      # short LLM summary
-    explanation = Column(String(2048), nullable=True)  # LLM explanation
-    raw_json = Column(JSON, nullable=True)             # full LLM response if you want
+    summary: Mapped[Optional[str]] = mapped_column(String(1024))      # short LLM summary
+    explanation: Mapped[Optional[str]] = mapped_column(String(2048))  # LLM explanation
+    raw_json: Mapped[Optional[Any]] = mapped_column(JSON)             # full LLM response if you want
 
     __table_args__ = (
         UniqueConstraint("symbol", "date", name="uq_news_impact_symbol_date"),
@@ -129,34 +132,46 @@ class NewsImpact(Base):
 class DailyCandidate(Base):
     __tablename__ = "daily_candidates"
 
-    id = Column(Integer, primary_key=True)
-    symbol = Column(String(32), ForeignKey("stocks.symbol"), index=True, nullable=False)
-    date = Column(Date, index=True, nullable=False)
+    id: Mapped[int] = mapped_column(primary_key=True)
+    symbol: Mapped[str] = mapped_column(String(32), ForeignKey("stocks.symbol"), index=True)
+    date: Mapped[datetime.date] = mapped_column(Date, index=True)
 
-    score = Column(Float, nullable=False)        # combined numeric score
-    bias = Column(String(16), nullable=False)    # 'bull', 'bear', 'unclear'
+    score: Mapped[float] = mapped_column(Float)        # combined numeric score
+    bias: Mapped[str] = mapped_column(String(16))    # 'bull', 'bear', 'unclear'
 
     # store all computed features (gap%, iv%, oi changes, etc.) as JSON
-    metadata_json = Column(JSON, nullable=True)
+    metadata_json: Mapped[Optional[Any]] = mapped_column(JSON)
 
-    is_active = Column(Boolean, default=True)  # for later if you want
+    is_active: Mapped[Optional[bool]] = mapped_column(Boolean, default=True)  # for later if you want
 
     __table_args__ = (
         UniqueConstraint("symbol", "date", name="uq_daily_candidates_symbol_date"),
-        Index("ix_daily_candidates_date_score", "date", "score"),
+        # Ordered + covering for "top-N by score on a date"; postgresql_include
+        # is ignored on other dialects
+        Index(
+            "ix_daily_candidates_date_score_desc",
+            date.desc(),
+            score.desc(),
+            postgresql_include=["symbol", "bias"],
+        ),
     )
 
 class BSEEvent(Base):
     __tablename__ = "bse_events"
 
-    id = Column(Integer, primary_key=True)
-    symbol = Column(String, index=True)
-    scrip_code = Column(String, index=True)
-    category = Column(String)
-    headline = Column(Text)
-    event_date = Column(Date)
-    published_at = Column(DateTime)
-    source = Column(String, default="BSE")
-    url = Column(Text)
-    content_hash = Column(String, unique=True, index=True)
-    created_at = Column(DateTime, server_default=func.now())
+    id: Mapped[int] = mapped_column(primary_key=True)
+    symbol: Mapped[Optional[str]] = mapped_column(String, index=True)
+    scrip_code: Mapped[Optional[str]] = mapped_column(String, index=True)
+    category: Mapped[Optional[str]] = mapped_column(String)
+    headline: Mapped[Optional[str]] = mapped_column(Text)
+    event_date: Mapped[Optional[datetime.date]] = mapped_column(Date)
+    published_at: Mapped[Optional[datetime.datetime]] = mapped_column(DateTime)
+    source: Mapped[Optional[str]] = mapped_column(String, default="BSE")
+    url: Mapped[Optional[str]] = mapped_column(Text)
+    content_hash: Mapped[Optional[str]] = mapped_column(String, unique=True, index=True)
+    created_at: Mapped[Optional[datetime.datetime]] = mapped_column(DateTime, server_default=func.now())
+
+    __table_args__ = (
+        # The announcement pipeline reads the latest few days, newest first
+        Index("ix_bse_events_event_date_desc", event_date.desc()),
+    )
@@ -1,10 +1,38 @@
+import orjson
 from sqlalchemy import create_engine
-from sqlalchemy.orm import sessionmaker, declarative_base
+from sqlalchemy.engine import make_url
+from sqlalchemy.orm import sessionmaker, DeclarativeBase
 
 from app.core.config import settings
 
 # Base class for all your models
-Base = declarative_base()
+class Base(DeclarativeBase):
+    pass
+
+
+def _json_dumps(value) -> str:
+    """orjson-backed serializer for JSON columns (numpy scalars and non-str keys allowed)."""
+    return orjson.dumps(value, option=orjson.OPT_SERIALIZE_NUMPY | orjson.OPT_NON_STR_KEYS).decode()
+
+
+def _bulk_insert_kwargs(database_url: str) -> dict:
+    """Driver-specific batch insert tuning; only the Postgres drivers take these."""
+    url = make_url(database_url)
+    if url.get_backend_name() != "postgresql":
+        return {}
+    kwargs = {"insertmanyvalues_page_size": 1000}
+    if url.get_driver_name() == "psycopg2":
+        # Multi-row VALUES for plain INSERTs, execute_batch for UPDATE/DELETE
+        kwargs.update(executemany_mode="values_plus_batch", executemany_batch_page_size=500)
+    return kwargs
+
+
+def _connect_args(database_url: str) -> dict:
+    """Postgres session settings: tag connections and cap runaway statements."""
+    if make_url(database_url).get_backend_name() != "postgresql":
+        return {}
+    return {"application_name": "option_agent", "options": "-c statement_timeout=30000"}
+
 
 # Create the engine once, at import time
 engine = create_engine(
@@ -12,7 +40,13 @@ engine = create_engine(
             pool_size=30,          
             max_overflow=50,       
             pool_timeout=60,
-            pool_pre_ping=True     
+            pool_pre_ping=True,
+            pool_recycle=1800,     # recycle before server/pgbouncer idle timeouts
+            pool_use_lifo=True,    # reuse hot connections; idle ones age out
+            connect_args=_connect_args(settings.database_url),
+            json_serializer=_json_dumps,
+            json_deserializer=orjson.loads,
+            **_bulk_insert_kwargs(settings.database_url)
 )
 
 SessionLocal = sessionmaker(
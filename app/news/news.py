@@ -1,10 +1,14 @@
-from fastapi import APIRouter, Depends, Query, HTTPException
+from fastapi import APIRouter, Depends, Query, HTTPException, Response
 from sqlalchemy.orm import Session
 import logging
-import json
+from functools import lru_cache
+
+import msgspec
+from pydantic import TypeAdapter, ValidationError
 
 from app.core.config import settings
 from app.core.logging_utils import get_logger
+from app.core.http_clients import groq_http_client
 from app.db.sessions import get_db
 from app.news.news_service import fetch_news_for_symbol
 from langchain_groq import ChatGroq
@@ -42,17 +46,29 @@ Return JSON with keys:
 
 parser = JsonOutputParser(pydantic_object=AIResponseSchema)
 
-# LLM client
-llm = ChatGroq(
-    model="llama-3.1-8b-instant", 
-    temperature=0.15,
-    groq_api_key=settings.groq_api_key,
-)
+# Schema doc string is static; build it once instead of per request
+FORMAT_INSTRUCTIONS = parser.get_format_instructions()
+
+# Validates the parsed LLM output whether it comes back as a dict or a model
+_AI_RESPONSE_ADAPTER = TypeAdapter(AIResponseSchema)
+
+# Max characters of news text sent to the LLM
+NEWS_BLOB_MAX_CHARS = 4000
+
 
-chain = prompt_template | llm | parser
+@lru_cache(maxsize=1)
+def _get_chain():
+    """Build the LLM client and chain on first use, once per process."""
+    llm = ChatGroq(
+        model="llama-3.1-8b-instant", 
+        temperature=0.15,
+        groq_api_key=settings.groq_api_key,
+        http_client=groq_http_client,
+    )
+    return prompt_template | llm | parser
 
 
-@router.get("/{symbol}/news-ai", response_model=AIStockNewsView)
+@router.get("/{symbol}/news-ai", response_class=Response)
 def stock_news_ai(
     symbol: str,
     window_days: int = Query(7, ge=1, le=30),
@@ -64,56 +80,66 @@ def stock_news_ai(
     GET /stocks/JSWENERGY/news-ai?window_days=7
     """
     symbol = symbol.upper().strip()
-    logger.info("Request news-ai for symbol=%s window_days=%d", symbol, window_days)
+    logger.debug("Request news-ai for symbol=%s window_days=%d", symbol, window_days)
 
     events = fetch_news_for_symbol(symbol, window_days=window_days, max_items=max_items)
 
     if not events:
-        logger.info("No news found for %s in last %d days", symbol, window_days)
-    news_text_lines = []
-    for e in events:
-        published = e.get("published_at") or e.get("published") or ""
-        title = e.get("title") or e.get("headline") or ""
-        url = e.get("url") or ""
-        news_text_lines.append(f"Title: {title}\nPublished: {published}\nURL: {url}\n")
-
-    news_blob = "\n\n".join(news_text_lines) or "No news found."
+        logger.debug("No news found for %s in last %d days", symbol, window_days)
+    news_text_lines = [
+        f"Title: {e.get('title') or e.get('headline') or ''}\n"
+        f"Published: {e.get('published_at') or e.get('published') or ''}\n"
+        f"URL: {e.get('url') or ''}\n"
+        for e in events
+    ]
+
+    # Keep whole items up to the prompt budget instead of joining everything
+    # and slicing the result
+    kept_lines = []
+    blob_len = 0
+    for line in news_text_lines:
+        if kept_lines and blob_len + len(line) > NEWS_BLOB_MAX_CHARS:
+            break
+        kept_lines.append(line)
+        blob_len += len(line) + 2  # "\n\n" separator
+
+    news_blob = "\n\n".join(kept_lines) or "No news found."
 
     payload = {
         "symbol": symbol,
         "window_days": window_days,
-        "news_blob": news_blob[:4000],  
-        "format_instructions": parser.get_format_instructions(),
+        "news_blob": news_blob[:NEWS_BLOB_MAX_CHARS],
+        "format_instructions": FORMAT_INSTRUCTIONS,
     }
 
     try:
-        ai_resp = chain.invoke(payload)
+        ai_resp = _get_chain().invoke(payload)
     except Exception as e:
         logger.exception("LLM call failed for %s: %s", symbol, e)
         raise HTTPException(status_code=500, detail="AI annotation failed")
 
     try:
-        ai_dict = ai_resp.dict() if not isinstance(ai_resp, dict) else ai_resp
-    except Exception:
-        try:
-            ai_dict = json.loads(ai_resp)
-        except Exception:
-            ai_dict = {
-                "ai_direction": None,
-                "ai_confidence": "low",
-                "ai_explanation": str(ai_resp),
-                "suggested_strategy": None,
-            }
-
-    out = {
-        "symbol": symbol,
-        "window_days": window_days,
-        "events": events,
-        "ai_direction": ai_dict.get("ai_direction"),
-        "ai_confidence": ai_dict.get("ai_confidence"),
-        "ai_explanation": ai_dict.get("ai_explanation"),
-        "suggested_strategy": ai_dict.get("suggested_strategy"),
-    }
-
-    logger.info("Returning news-ai for %s: direction=%s confidence=%s", symbol, out["ai_direction"], out["ai_confidence"])
-    return out
+        ai_dict = _AI_RESPONSE_ADAPTER.validate_python(ai_resp).model_dump()
+    except ValidationError:
+        # Partial/odd LLM output: keep whatever keys a dict has, else fall back
+        ai_dict = ai_resp if isinstance(ai_resp, dict) else {
+            "ai_direction": None,
+            "ai_confidence": "low",
+            "ai_explanation": str(ai_resp),
+            "suggested_strategy": None,
+        }
+
+    out = AIStockNewsView(
+        symbol=symbol,
+        window_days=window_days,
+        events=events,
+        ai_direction=ai_dict.get("ai_direction"),
+        ai_confidence=ai_dict.get("ai_confidence"),
+        ai_explanation=ai_dict.get("ai_explanation"),
+        suggested_strategy=ai_dict.get("suggested_strategy"),
+    )
+
+    if logger.isEnabledFor(logging.DEBUG):
+        logger.debug("Returning news-ai for %s: direction=%s confidence=%s", symbol, out.ai_direction, out.ai_confidence)
+    # Encode with msgspec directly; no response_model so FastAPI doesn't re-validate
+    return Response(content=msgspec.json.encode(out), media_type="application/json")
@@ -1,18 +1,36 @@
 import logging
 from datetime import datetime, timedelta
+from operator import itemgetter
 from typing import List, Dict, Any
 import requests
+from requests.adapters import HTTPAdapter
+from urllib3.util.retry import Retry
 from xml.etree import ElementTree as ET
 from urllib.parse import quote_plus
 from app.core.config import settings
 
 logger = logging.getLogger(__name__)
 
+# One pooled session per process so repeated news fetches reuse keep-alive
+# TLS connections instead of a new handshake per call
+_SESSION = requests.Session()
+_SESSION.mount(
+    "https://",
+    HTTPAdapter(pool_connections=16, pool_maxsize=32, max_retries=Retry(total=2, backoff_factor=0.2)),
+)
+
+# Search terms appended to the quoted symbol in every news query
+_NEWS_SUFFIX = "(stock OR shares OR results OR tender)"
+
+# <item> children read from the Google News RSS feed
+_RSS_ITEM_FIELDS = ("title", "link", "pubDate")
+_get_rss_item_fields = itemgetter(*_RSS_ITEM_FIELDS)
+
 
 def _gnews_fetch(q: str, from_dt: str, api_key: str, max_items: int = 10):
     url = "https://gnews.io/api/v4/search"
     params = {"q": q, "from": from_dt, "max": max_items, "lang": "en", "apikey": api_key}
-    resp = requests.get(url, params=params, timeout=8)
+    resp = _SESSION.get(url, params=params, timeout=8)
     resp.raise_for_status()
     data = resp.json()
     out = []
@@ -32,23 +50,30 @@ def _google_news_rss_fetch(q: str, days: int = 7, max_items: int = 10) -> List[D
     rss_q = quote_plus(q)
     url = f"https://news.google.com/rss/search?q={rss_q}&hl=en-IN&gl=IN&ceid=IN:en"
     try:
-        resp = requests.get(url, timeout=10)
-        resp.raise_for_status()
-        root = ET.fromstring(resp.content)
         items = []
         cutoff = datetime.utcnow() - timedelta(days=days)
-        for it in root.findall(".//item")[:max_items]:
-            title = it.findtext("title")
-            link = it.findtext("link")
-            pub = it.findtext("pubDate")
-            # pubDate parse loosely
-            items.append({
-                "title": title,
-                "summary": "",  # RSS doesn't provide summary consistently
-                "url": link,
-                "published_at": pub,
-                "source": "Google News",
-            })
+        # Stream-parse and stop after max_items instead of building the whole feed DOM
+        with _SESSION.get(url, timeout=10, stream=True) as resp:
+            resp.raise_for_status()
+            resp.raw.decode_content = True
+            for _, it in ET.iterparse(resp.raw, events=("end",)):
+                if it.tag != "item":
+                    continue
+                # One pass over the item's children instead of a findtext scan per field
+                fields = dict.fromkeys(_RSS_ITEM_FIELDS)
+                fields.update((child.tag, child.text) for child in it)
+                title, link, pub = _get_rss_item_fields(fields)
+                it.clear()
+                # pubDate parse loosely
+                items.append({
+                    "title": title,
+                    "summary": "",  # RSS doesn't provide summary consistently
+                    "url": link,
+                    "published_at": pub,
+                    "source": "Google News",
+                })
+                if len(items) >= max_items:
+                    break
         return items
     except Exception as e:
         logger.warning("Google News RSS fetch failed: %s", e)
@@ -65,7 +90,7 @@ def fetch_news_for_symbol(symbol: str, window_days: int = 7, max_items: int = 10
 
     gnews_api_key = settings.gnews_api_key
     # Build query: symbol + company name heuristics could be added later; for now use symbol
-    q = f"{symbol} OR {symbol} stock OR {symbol} shares OR {symbol} results OR {symbol} tender"
+    q = f'"{symbol}" {_NEWS_SUFFIX}'
 
     from_dt = (datetime.utcnow() - timedelta(days=window_days)).strftime("%Y-%m-%d")
 
@@ -1,7 +1,10 @@
 from typing import List, Dict, Any, Optional
+
+import msgspec
 from pydantic import BaseModel, Field
 
-class AIStockNewsView(BaseModel):
+class AIStockNewsView(msgspec.Struct):
+    """Response for /news/{symbol}/news-ai, encoded directly with msgspec."""
     symbol: str
     window_days: int
     events: List[Dict[str, Any]]
@@ -1,24 +1,86 @@
 """
 LLM-based service to classify BSE announcements for high volatility potential.
 """
-import time
-from typing import Dict, Any, Optional, List
+import asyncio
+import heapq
+import logging
+import re
+from functools import lru_cache
+from operator import itemgetter
+from typing import Dict, Any, Optional, List, NamedTuple, Tuple
+import ahocorasick
+import httpx
+from tenacity import (
+    before_sleep_log,
+    retry,
+    retry_if_exception,
+    stop_after_attempt,
+    wait_exponential_jitter,
+)
+from groq import APIConnectionError, APIStatusError, APITimeoutError
 from langchain_groq import ChatGroq
 from langchain_core.prompts import ChatPromptTemplate
 from langchain_core.output_parsers import JsonOutputParser
+from langchain_core.runnables import Runnable
 
 from app.core.config import settings
 from app.core.logging_utils import get_logger
-from app.ai.ai_validator import AIEventImpact
+from app.core.cache import TTLCache, make_cache_key
+from app.core.http_clients import GROQ_HTTP_LIMITS, GROQ_HTTP_TIMEOUT, groq_http_client
+from app.services.rate_limiter import RollingWindowLimiter
+from app.ai.ai_validator import AIEventImpact, BatchAIEventImpact
 
 logger = get_logger(__name__)
 
-# Rate limiting: delay between LLM calls to avoid hitting Groq limits
-# Groq free tier: ~30 requests/minute, paid: higher
-LLM_CALL_DELAY = 2.0  # seconds between calls (30 calls = 60 seconds = 1 minute)
+# Cache successful classifications for a day so re-runs over the same
+# announcements (overlapping lookback windows, repeat API calls) skip the LLM
+CLASSIFICATION_CACHE_TTL = 24 * 60 * 60  # seconds
+CLASSIFICATION_CACHE_MAXSIZE = 5000  # entries, least recently used evicted first
+_classification_cache = TTLCache(
+    ttl_seconds=CLASSIFICATION_CACHE_TTL,
+    maxsize=CLASSIFICATION_CACHE_MAXSIZE,
+)
+
+# Words dropped from headlines before building classification cache keys
+HEADLINE_FILLER_WORDS = frozenset({
+    "a", "an", "the", "of", "for", "to", "in", "on", "at", "by", "and", "with",
+    "from", "under", "regarding", "re", "reg", "pursuant", "dated", "ltd", "limited",
+})
+
+# Rate limiting: concurrent in-flight LLM calls for batched classification
+# (pipeline shortlist and event candidates), kept small to avoid hitting Groq limits
+# Groq free tier: ~30 requests/minute, paid: higher (set GROQ_MAX_CONCURRENCY)
+LLM_MAX_CONCURRENCY = settings.groq_max_concurrency
+
+# Retries (exponential backoff with jitter, via tenacity) when Groq returns a
+# rate-limit, 5xx or connection error; a retry-after header overrides the backoff
+RATE_LIMIT_MAX_RETRIES = 3
+RETRYABLE_STATUS_CODES = frozenset({429, 500, 502, 503, 504})
+RETRY_AFTER_MAX_SECONDS = 60
+
+# Rough token estimate for a classification call: static instructions + schema,
+# plus per announcement its headline (~4 chars/token) and the JSON it produces
+PROMPT_BASE_TOKENS = 600
+PER_ANNOUNCEMENT_TOKENS = 100
+
+# Shared RPM/TPM budget for all classification calls in this process
+_llm_limiter = RollingWindowLimiter(
+    rpm_limit=settings.groq_rpm_limit,
+    tpm_limit=settings.groq_tpm_limit,
+)
+
+# Announcements classified per LLM call in batched classification
+CLASSIFY_GROUP_SIZE = 8
+
+# Estimated token budget per grouped call; a group is closed early once the
+# next announcement would push it over (long headlines)
+CLASSIFY_GROUP_MAX_TOKENS = 3000
+
+# Classified announcements shown in the results log of each pipeline run
+TOP_RESULTS_LOG_SIZE = 15
 
 # High-impact keywords that typically cause significant stock movement
-HIGH_IMPACT_KEYWORDS = [
+HIGH_IMPACT_KEYWORDS = tuple(kw.lower() for kw in [
     # Results announcements (highest impact)
     "result", "quarter", "q1", "q2", "q3", "q4", "annual", "financial",
     "earnings", "profit", "revenue", "loss", "guidance", "outlook",
@@ -46,11 +108,165 @@ HIGH_IMPACT_KEYWORDS = [
     # Management changes (medium impact)
     "ceo", "md", "director", "resignation", "appointment",
     "board", "management",
-]
+])
+
+# Pre-filter score per matched keyword: results/orders 3, corporate
+# actions/fund raising 2, everything else 1
+KEYWORD_WEIGHTS = {kw: 1 for kw in HIGH_IMPACT_KEYWORDS}
+KEYWORD_WEIGHTS.update(dict.fromkeys(
+    ["result", "quarter", "q1", "q2", "q3", "q4", "order", "contract", "tender", "award"], 3
+))
+KEYWORD_WEIGHTS.update(dict.fromkeys(
+    ["merger", "acquisition", "fund raising", "qip", "buyback", "dividend"], 2
+))
+
+# Dedup keyword tiers: bonus added once if any keyword of the tier appears
+RESULT_KEYWORDS = ("result", "quarter", "q1", "q2", "q3", "q4", "earnings", "financial")
+ORDER_KEYWORDS = ("order", "contract", "tender", "award", "loi", "mou", "win", "bagged")
+CORP_ACTION_KEYWORDS = ("merger", "acquisition", "buyback", "dividend", "bonus", "split")
+FUND_RAISING_KEYWORDS = ("fund raising", "qip", "fpo", "rights issue", "preferential")
+
+PRE_CLASSIFICATION_DEDUP_TIERS = (
+    (RESULT_KEYWORDS, 100),
+    (ORDER_KEYWORDS, 80),
+    (CORP_ACTION_KEYWORDS, 60),
+    (FUND_RAISING_KEYWORDS, 50),
+)
 
-# Prompt template for classifying announcements
-classification_prompt = ChatPromptTemplate.from_template(
+
+class _KeywordScanner:
+    """
+    Finds every keyword that occurs in a text in one Aho-Corasick pass,
+    instead of one substring check per keyword.
+    
+    Matches are plain substrings (same as `kw in text`), overlaps included.
     """
+    
+    def __init__(self, keywords):
+        self._automaton = ahocorasick.Automaton()
+        for kw in keywords:
+            self._automaton.add_word(kw, kw)
+        self._automaton.make_automaton()
+    
+    def matches(self, text: str) -> set:
+        return {kw for _, kw in self._automaton.iter(text)}
+
+
+# Dedup tier keywords are all high-impact keywords, so one scanner serves both
+_high_impact_scanner = _KeywordScanner(HIGH_IMPACT_KEYWORDS)
+
+# Distinct (headline, category) pairs whose keyword scan is memoized; reposts
+# and repeated categories across runs skip the scan
+KEYWORD_SCAN_CACHE_SIZE = 10_000
+
+
+# Category tiers (first match wins): results > corporate action > board meeting
+CATEGORY_BOOST_TIERS = (("result",), ("corp. action", "corporate action"), ("board meeting",))
+PRE_FILTER_CATEGORY_BOOSTS = (5, 3, 2)
+DEDUP_CATEGORY_BOOSTS = (50, 40, 10)
+
+
+def _category_boost(category: str, boosts) -> int:
+    """Boost for the first category tier the (lowercased) category falls in."""
+    for patterns, boost in zip(CATEGORY_BOOST_TIERS, boosts):
+        if any(pattern in category for pattern in patterns):
+            return boost
+    return 0
+
+
+def _tier_score(matched: set, tiers) -> int:
+    """Sum the bonus of every tier with at least one matched keyword."""
+    return sum(bonus for keywords, bonus in tiers if not matched.isdisjoint(keywords))
+
+# Routine/administrative announcements that never move the stock; these are
+# dropped without an LLM call
+OBVIOUSLY_NEUTRAL_PATTERN = re.compile(
+    r"registrar|trading window|record date|book closure|postal ballot|code of conduct"
+    r"|newspaper publication|loss of share certificate|duplicate share certificate"
+    r"|compliance certificate|investor meet",
+    re.IGNORECASE,
+)
+
+
+@lru_cache(maxsize=KEYWORD_SCAN_CACHE_SIZE)
+def _matched_keywords(headline: str, category: str) -> frozenset:
+    """High-impact keywords in the lowercased headline + category."""
+    return frozenset(_high_impact_scanner.matches(f"{headline.lower()} {category.lower()}"))
+
+
+@lru_cache(maxsize=KEYWORD_SCAN_CACHE_SIZE)
+def _text_scores(headline: str, category: str) -> Tuple[int, int]:
+    matched = _matched_keywords(headline, category)
+    category = category.lower()
+    
+    if matched or not OBVIOUSLY_NEUTRAL_PATTERN.search(f"{headline} {category}"):
+        pre_filter_score = sum(KEYWORD_WEIGHTS[kw] for kw in matched)
+        pre_filter_score += _category_boost(category, PRE_FILTER_CATEGORY_BOOSTS)
+    else:
+        # Routine notice with no high-impact keyword: only its category boost
+        # would get it past the pre-filter, so drop it before the LLM
+        pre_filter_score = 0
+    
+    dedup_score = _tier_score(matched, PRE_CLASSIFICATION_DEDUP_TIERS)
+    dedup_score += _category_boost(category, DEDUP_CATEGORY_BOOSTS)
+    
+    return pre_filter_score, dedup_score
+
+
+def _keyword_scores(ann: Dict[str, Any]) -> Tuple[int, int]:
+    """(pre-filter score, pre-classification dedup score) from a single keyword scan."""
+    return _text_scores(ann.get("headline", ""), ann.get("category") or "")
+
+
+def is_obviously_neutral(headline: Optional[str], category: Optional[str] = None) -> bool:
+    """
+    Cheap keyword check for announcements that are clearly routine/neutral.
+    
+    A routine match is overridden, as in the pipeline pre-filter, when a
+    high-impact keyword or a classification rule also matches ("Record date
+    for bonus issue" is not skipped).
+    """
+    headline = headline or ""
+    category = category or ""
+    if not OBVIOUSLY_NEUTRAL_PATTERN.search(f"{headline} {category}"):
+        return False
+    return not _matched_keywords(headline, category) and _rule_based_classification(headline) is None
+
+
+def _neutral_rule(confidence: str, explanation: str) -> Dict[str, Any]:
+    return {
+        "event_type": "neutral",
+        "ai_direction": "neutral",
+        "reaction_window": "1_3_days",
+        "confidence": confidence,
+        "explanation": explanation,
+    }
+
+
+# Headlines whose classification is fixed; these are answered without an LLM
+# call (first match wins). Only patterns with no directional content belong here
+# (not board meeting intimations: their agenda - results, buyback, fund
+# raising - is what the classifier needs to see)
+CLASSIFICATION_RULES = (
+    (re.compile(r"\b(loss|duplicate) of share certificates?\b", re.IGNORECASE),
+     _neutral_rule("high", "Administrative: share certificate notice")),
+    (re.compile(r"\bnewspaper (publication|advertisement)s?\b", re.IGNORECASE),
+     _neutral_rule("high", "Administrative: newspaper publication")),
+)
+
+
+def _rule_based_classification(headline: Optional[str]) -> Optional[Dict[str, Any]]:
+    """Fixed classification for headlines matching CLASSIFICATION_RULES, else None."""
+    if not headline:
+        return None
+    for pattern, classification in CLASSIFICATION_RULES:
+        if pattern.search(headline):
+            return dict(classification)
+    return None
+
+
+# Static analyst instructions shared by the single and grouped prompts
+CLASSIFICATION_INSTRUCTIONS = """
 You are an expert Indian stock market analyst specializing in derivatives trading.
 You analyze corporate announcements to predict which ones will cause high volatility
 in stock prices the NEXT trading day, making them suitable for options trading.
@@ -74,100 +290,295 @@ Guidelines:
   it's likely high-impact. Mark it as bullish or bearish (not neutral) with at least medium confidence.
 - Be reasonable: Don't be overly conservative. If it's clearly a results announcement or major order, 
   it WILL move the stock - mark it accordingly.
+"""
 
-Announcement Details:
+# Prompt template for classifying announcements.
+# Static instructions and schema go in the system message, with category
+# first in the user message and the per-announcement fields last, so calls
+# share the longest possible prefix (provider-side prefix caching), especially
+# within one category.
+classification_prompt = ChatPromptTemplate.from_messages([
+    ("system", CLASSIFICATION_INSTRUCTIONS + """
+Return JSON matching this schema:
+{format_instructions}
+"""),
+    ("human", """Announcement Details:
+- Category: {category}
 - Symbol: {symbol}
 - Headline: {headline}
 - Date: {event_date}
-- Category: {category}
+"""),
+])
 
+# Prompt template for classifying several announcements in one call; the
+# instructions are paid for once per group instead of once per announcement
+batch_classification_prompt = ChatPromptTemplate.from_messages([
+    ("system", CLASSIFICATION_INSTRUCTIONS + """
 Return JSON matching this schema:
 {format_instructions}
-"""
-)
+"""),
+    ("human", """Classify each of the following {count} announcements. Return exactly one entry
+in "results" per announcement, in the same order as listed.
 
-# Output parser
+Announcements (category | symbol | date | headline):
+{announcements}
+"""),
+])
+
+# Output parsers
 parser = JsonOutputParser(pydantic_object=AIEventImpact)
+batch_parser = JsonOutputParser(pydantic_object=BatchAIEventImpact)
+
+# Groq JSON mode guarantees syntactically valid JSON, so the prompt only
+# needs the shape; the enum values are already listed in the instructions.
+# Inlined instead of parser.get_format_instructions() (full JSON schema,
+# ~250 tokens more per call)
+EVENT_IMPACT_JSON_SHAPE = (
+    '{"event_type":"results_positive|results_negative|order_win|order_loss|fund_raise|regulatory|neutral",'
+    '"ai_direction":"bullish|bearish|neutral","reaction_window":"same_day|next_day|1_3_days",'
+    '"confidence":"low|medium|high","explanation":"1-2 sentences"}'
+)
+FORMAT_INSTRUCTIONS = EVENT_IMPACT_JSON_SHAPE
+BATCH_FORMAT_INSTRUCTIONS = '{"results":[' + EVENT_IMPACT_JSON_SHAPE + ', ...]}'
+JSON_MODE = {"type": "json_object"}
+
+# Output cap for single-announcement calls (one short JSON object); grouped
+# calls scale with the group and are left uncapped
+CLASSIFY_MAX_OUTPUT_TOKENS = 256
 
 
-def pre_filter_high_impact_announcements(
+def select_top_unique_announcements(
     announcements: List[Dict[str, Any]],
     max_results: int = 30
 ) -> List[Dict[str, Any]]:
     """
-    Pre-filter announcements by keywords to prioritize high-impact events
-    before sending to LLM. This reduces LLM calls and focuses on announcements
-    most likely to cause significant stock movement.
+    Pre-classification dedup and keyword pre-filter in a single pass.
     
-    Note: Assumes announcements are already filtered to FNO universe stocks.
+    Keeps the best announcement per symbol (results and orders first, by
+    dedup score), then the top max_results of those by pre-filter score,
+    dropping announcements with no keyword match. Each announcement is
+    scanned for keywords once.
     
     Args:
-        announcements: List of announcement dicts with headline, symbol, etc.
+        announcements: List of announcement dicts with symbol, headline, category
         max_results: Maximum number of announcements to return
         
     Returns:
-        Filtered list prioritized by keyword matches
+        At most one announcement per symbol, top max_results by keyword relevance
     """
     if not announcements:
         return []
     
-    scored_announcements = []
-    
+    # symbol -> (dedup score, pre-filter score, announcement, announcements seen)
+    best_by_symbol: Dict[str, Tuple[int, int, Dict[str, Any], int]] = {}
     for ann in announcements:
-        headline = ann.get("headline", "").lower()
-        category = ann.get("category", "").lower() if ann.get("category") else ""
-        combined_text = f"{headline} {category}"
-        
-        # Calculate score based on keyword matches
-        score = 0
-        
-        # Check for high-impact keywords
-        for keyword in HIGH_IMPACT_KEYWORDS:
-            if keyword.lower() in combined_text:
-                # Results and orders get highest priority
-                if keyword in ["result", "quarter", "q1", "q2", "q3", "q4", "order", "contract", "tender", "award"]:
-                    score += 3
-                # Corporate actions and fund raising get high priority
-                elif keyword in ["merger", "acquisition", "fund raising", "qip", "buyback", "dividend"]:
-                    score += 2
-                # Other keywords get medium priority
-                else:
-                    score += 1
-        
-        # Boost score for certain categories
-        if "result" in category:
-            score += 5
-        elif "corp. action" in category or "corporate action" in category:
-            score += 3
-        elif "board meeting" in category:
-            score += 2
+        symbol = ann.get("symbol")
+        if not symbol:
+            continue
+        symbol = symbol.upper()
+        pre_filter_score, dedup_score = _keyword_scores(ann)
         
-        # Only include announcements with at least one keyword match
-        if score > 0:
-            scored_announcements.append((score, ann))
+        best = best_by_symbol.get(symbol)
+        if best is None:
+            best_by_symbol[symbol] = (dedup_score, pre_filter_score, ann, 1)
+        elif dedup_score > best[0]:
+            best_by_symbol[symbol] = (dedup_score, pre_filter_score, ann, best[3] + 1)
+        else:
+            best_by_symbol[symbol] = best[:3] + (best[3] + 1,)
     
-    # Sort by score (highest first)
-    scored_announcements.sort(key=lambda x: x[0], reverse=True)
+    for symbol, (_, _, ann, seen) in best_by_symbol.items():
+        if seen > 1:
+            logger.info(
+                f"Pre-classification deduplication {symbol}: kept 1 announcement out of {seen} "
+                f"(selected: {ann.get('headline', '')[:60]}...)"
+            )
+    logger.info(
+        f"Pre-classification deduplication: {len(announcements)} -> {len(best_by_symbol)} "
+        f"({len(announcements) - len(best_by_symbol)} duplicates removed)"
+    )
     
-    # Return top N
-    filtered = [ann for _, ann in scored_announcements[:max_results]]
+    # Only announcements with at least one keyword match; top N by score
+    scored = ((score, ann) for _, score, ann, _ in best_by_symbol.values() if score > 0)
+    top = heapq.nlargest(max_results, scored, key=itemgetter(0))
+    filtered = [ann for _, ann in top]
     
     logger.info(
-        f"Pre-filtered {len(filtered)} high-impact announcements from {len(announcements)} "
+        f"Pre-filtered {len(filtered)} high-impact announcements from {len(best_by_symbol)} "
         f"(top {max_results} by keyword relevance)"
     )
     
     return filtered
 
-# LLM client
-llm = ChatGroq(
-    model="llama-3.3-70b-versatile",  # Changed from model_name to model for langchain-core 1.x
-    temperature=0.2,
-    groq_api_key=settings.groq_api_key,
-)
+class ClassificationChains(NamedTuple):
+    """Single and grouped classification chains for the fast and strong models."""
+    fast: Runnable
+    strong: Runnable
+    fast_batch: Runnable
+    strong_batch: Runnable
+
+
+def _build_classification_chains(
+    http_async_client: Optional[httpx.AsyncClient] = None
+) -> ClassificationChains:
+    """
+    Build the classification chains.
+    
+    Most announcements are clear-cut, so the small model goes first; the 70B
+    model only sees what it fails on or marks low confidence. Sync calls reuse
+    the process-wide Groq connection pool. Async calls use http_async_client,
+    which must belong to the event loop the chains are awaited on (pooled
+    connections are bound to the loop that opened them).
+    Temperature 0: a label lookup, so the same input should give the same
+    (cacheable) answer on every run.
+    """
+    fast_llm = ChatGroq(
+        model="llama-3.1-8b-instant",
+        temperature=0,
+        groq_api_key=settings.groq_api_key,
+        http_client=groq_http_client,
+        http_async_client=http_async_client,
+    )
+    llm = ChatGroq(
+        model="llama-3.3-70b-versatile",  # Changed from model_name to model for langchain-core 1.x
+        temperature=0,
+        groq_api_key=settings.groq_api_key,
+        http_client=groq_http_client,
+        http_async_client=http_async_client,
+    )
+    
+    # Groq JSON mode, so the parser never sees malformed output
+    fast_json_llm = fast_llm.bind(response_format=JSON_MODE)
+    json_llm = llm.bind(response_format=JSON_MODE)
+    return ClassificationChains(
+        fast=classification_prompt | fast_json_llm.bind(max_tokens=CLASSIFY_MAX_OUTPUT_TOKENS) | parser,
+        strong=classification_prompt | json_llm.bind(max_tokens=CLASSIFY_MAX_OUTPUT_TOKENS) | parser,
+        fast_batch=batch_classification_prompt | fast_json_llm | batch_parser,
+        strong_batch=batch_classification_prompt | json_llm | batch_parser,
+    )
+
+
+# Chains for sync calls; async runs build their own (see _classify_concurrently)
+_sync_chains = _build_classification_chains()
+
+
+def _build_classification_input(
+    symbol: str,
+    headline: str,
+    event_date: str,
+    category: Optional[str] = None
+) -> Dict[str, Any]:
+    """Build the prompt input dict for one announcement."""
+    return {
+        "symbol": symbol,
+        "headline": headline,
+        "event_date": event_date,
+        "category": category or "unknown",
+        "format_instructions": FORMAT_INSTRUCTIONS,
+    }
+
+
+def _normalize_headline(headline: Optional[str]) -> str:
+    """
+    Canonical headline for cache keys: the distinct non-filler words, sorted.
+    
+    Rephrasings of the same filing ("Board Meeting Intimation for ..." vs
+    "Intimation of Board Meeting for ...") map to the same form; numbers and
+    content words (Q2 vs Q3, order vs merger) still tell headlines apart.
+    """
+    words = set(re.findall(r"[a-z0-9]+", (headline or "").lower())) - HEADLINE_FILLER_WORDS
+    return " ".join(sorted(words))
+
+
+def _classification_cache_key(
+    symbol: str,
+    headline: str,
+    category: Optional[str] = None
+) -> str:
+    """Cache key ignoring date, case, punctuation and word order, so BSE reposts hit the cache."""
+    return make_cache_key((symbol or "").upper(), _normalize_headline(headline), category or "")
+
+
+def _default_classification(error: Exception) -> Dict[str, Any]:
+    """Neutral/default classification used when the LLM call fails."""
+    return {
+        "event_type": "neutral",
+        "ai_direction": "neutral",
+        "reaction_window": "1_3_days",
+        "confidence": "low",
+        "explanation": f"Classification error: {str(error)}",
+    }
+
+
+def _estimate_tokens(headlines: List[Optional[str]]) -> int:
+    """Estimated prompt + completion tokens for classifying these headlines in one call."""
+    return PROMPT_BASE_TOKENS + sum(
+        len(headline or "") // 4 + PER_ANNOUNCEMENT_TOKENS for headline in headlines
+    )
+
+
+def _group_by_budget(
+    headlines: List[Optional[str]],
+    group_size: int = CLASSIFY_GROUP_SIZE,
+    max_tokens: int = CLASSIFY_GROUP_MAX_TOKENS
+) -> List[List[int]]:
+    """Split positions into groups of at most group_size and about max_tokens each."""
+    groups: List[List[int]] = []
+    current: List[int] = []
+    for pos, headline in enumerate(headlines):
+        if current and (
+            len(current) >= group_size
+            or _estimate_tokens([headlines[i] for i in current + [pos]]) > max_tokens
+        ):
+            groups.append(current)
+            current = []
+        current.append(pos)
+    if current:
+        groups.append(current)
+    return groups
+
 
-# Chain
-classification_chain = classification_prompt | llm | parser
+def _is_rate_limit_error(error: Exception) -> bool:
+    return "429" in str(error) or "rate limit" in str(error).lower()
+
+
+def _is_retryable_llm_error(error: Exception) -> bool:
+    """Rate limits, Groq 5xx and connection/timeout errors are worth retrying."""
+    if isinstance(error, (APIConnectionError, APITimeoutError)):
+        return True
+    if isinstance(error, APIStatusError):
+        return error.status_code in RETRYABLE_STATUS_CODES
+    return _is_rate_limit_error(error)
+
+
+def _retry_after_seconds(error: Optional[BaseException]) -> Optional[float]:
+    """Seconds from the response's retry-after header, if Groq sent one."""
+    headers = getattr(getattr(error, "response", None), "headers", None)
+    try:
+        return float(headers["retry-after"]) if headers and "retry-after" in headers else None
+    except ValueError:
+        return None
+
+
+_backoff = wait_exponential_jitter(initial=1, max=30)
+
+
+def _wait_for_retry(retry_state) -> float:
+    """Honour retry-after when present, else exponential backoff with jitter."""
+    retry_after = _retry_after_seconds(retry_state.outcome.exception())
+    if retry_after is not None:
+        return min(retry_after, RETRY_AFTER_MAX_SECONDS)
+    return _backoff(retry_state)
+
+
+# Retry async LLM calls on rate limits and transient Groq errors, then
+# re-raise the last error
+_retry_on_transient_error = retry(
+    retry=retry_if_exception(_is_retryable_llm_error),
+    wait=_wait_for_retry,
+    stop=stop_after_attempt(RATE_LIMIT_MAX_RETRIES + 1),
+    before_sleep=before_sleep_log(logger, logging.WARNING),
+    reraise=True,
+)
 
 
 def classify_announcement(
@@ -188,28 +599,330 @@ def classify_announcement(
     Returns:
         Dictionary with event_type, ai_direction, reaction_window, confidence, explanation
     """
+    ruled = _rule_based_classification(headline)
+    if ruled is not None:
+        logger.debug(f"Rule-based classification for {symbol}")
+        return ruled
+    
+    cache_key = _classification_cache_key(symbol, headline, category)
+    cached = _classification_cache.get(cache_key)
+    if cached is not None:
+        logger.debug(f"Classification cache hit for {symbol}")
+        return dict(cached)
+    
     try:
-        result = classification_chain.invoke({
-            "symbol": symbol,
-            "headline": headline,
-            "event_date": event_date,
-            "category": category or "unknown",
-            "format_instructions": parser.get_format_instructions(),
-        })
+        result = _route_classification(
+            _build_classification_input(symbol, headline, event_date, category)
+        )
         
         logger.debug(f"Classified announcement for {symbol}: {result.get('ai_direction')} ({result.get('confidence')} confidence)")
+        _classification_cache.set(cache_key, dict(result))
         return result
         
     except Exception as e:
         logger.error(f"Error classifying announcement for {symbol}: {e}")
         # Return neutral/default classification on error
-        return {
-            "event_type": "neutral",
-            "ai_direction": "neutral",
-            "reaction_window": "1_3_days",
-            "confidence": "low",
-            "explanation": f"Classification error: {str(e)}",
-        }
+        return _default_classification(e)
+
+
+@_retry_on_transient_error
+async def _ainvoke_classification(
+    chains: ClassificationChains,
+    symbol: str,
+    headline: str,
+    event_date: str,
+    category: Optional[str] = None
+) -> Dict[str, Any]:
+    """Async cached LLM classification; raises on LLM errors."""
+    ruled = _rule_based_classification(headline)
+    if ruled is not None:
+        logger.debug(f"Rule-based classification for {symbol}")
+        return ruled
+    
+    cache_key = _classification_cache_key(symbol, headline, category)
+    cached = _classification_cache.get(cache_key)
+    if cached is not None:
+        logger.debug(f"Classification cache hit for {symbol}")
+        return dict(cached)
+    
+    result = await _aroute_classification(
+        chains,
+        _build_classification_input(symbol, headline, event_date, category),
+        _estimate_tokens([headline]),
+    )
+    
+    logger.debug(f"Classified announcement for {symbol}: {result.get('ai_direction')} ({result.get('confidence')} confidence)")
+    _classification_cache.set(cache_key, dict(result))
+    return result
+
+
+async def aclassify_announcement(
+    chains: ClassificationChains,
+    symbol: str,
+    headline: str,
+    event_date: str,
+    category: Optional[str] = None
+) -> Dict[str, Any]:
+    """
+    Async version of classify_announcement on the given chains.
+    Returns the neutral/default classification on error.
+    """
+    try:
+        return await _ainvoke_classification(chains, symbol, headline, event_date, category)
+    except Exception as e:
+        logger.error(f"Error classifying announcement for {symbol}: {e}")
+        return _default_classification(e)
+
+
+def _item_fields(item: Dict[str, Any]) -> tuple:
+    """(symbol, headline, event_date, category) for an announcement dict."""
+    event_date = item.get("event_date")
+    return (
+        item.get("symbol"),
+        item.get("headline"),
+        str(event_date) if event_date else "",
+        item.get("category"),
+    )
+
+
+def _build_group_input(items: List[Dict[str, Any]]) -> Dict[str, Any]:
+    """Build the grouped prompt input: one numbered line per announcement."""
+    lines = []
+    for n, item in enumerate(items, start=1):
+        symbol, headline, event_date, category = _item_fields(item)
+        lines.append(f"{n}. {category or 'unknown'} | {symbol} | {event_date} | {headline}")
+    return {
+        "count": len(items),
+        "announcements": "\n".join(lines),
+        "format_instructions": BATCH_FORMAT_INSTRUCTIONS,
+    }
+
+
+def _unpack_group_result(result: Dict[str, Any], expected: int) -> List[Dict[str, Any]]:
+    """Pull the per-announcement results out of a grouped response."""
+    results = result.get("results") if isinstance(result, dict) else None
+    if not isinstance(results, list) or len(results) != expected:
+        got = len(results) if isinstance(results, list) else 0
+        raise ValueError(f"expected {expected} results, got {got}")
+    return results
+
+
+def _split_cached(items: List[Dict[str, Any]]):
+    """
+    Look items up in the classification rules and cache.
+    
+    Returns:
+        (classifications with rule/cache hits filled in, cache keys, indexes of misses)
+    """
+    classifications: List[Optional[Dict[str, Any]]] = [None] * len(items)
+    cache_keys = []
+    miss_indexes = []
+    
+    for idx, item in enumerate(items):
+        symbol, headline, _, category = _item_fields(item)
+        cache_key = _classification_cache_key(symbol, headline, category)
+        cache_keys.append(cache_key)
+        ruled = _rule_based_classification(headline)
+        if ruled is not None:
+            classifications[idx] = ruled
+            continue
+        cached = _classification_cache.get(cache_key)
+        if cached is not None:
+            classifications[idx] = dict(cached)
+        else:
+            miss_indexes.append(idx)
+    
+    logger.debug(
+        f"Classification rules/cache: {len(items) - len(miss_indexes)} hits, {len(miss_indexes)} misses"
+    )
+    return classifications, cache_keys, miss_indexes
+
+
+def _needs_escalation(classification: Dict[str, Any]) -> bool:
+    return classification.get("confidence") == "low"
+
+
+def _route_classification(classification_input: Dict[str, Any]) -> Dict[str, Any]:
+    """
+    Classify with the fast model, escalating to the strong model when the fast
+    call fails or comes back low confidence. Raises if nothing usable comes back.
+    """
+    fast_result = None
+    try:
+        fast_result = _sync_chains.fast.invoke(classification_input)
+        if not _needs_escalation(fast_result):
+            return fast_result
+    except Exception as e:
+        logger.debug(f"Fast classifier failed ({e}); escalating")
+    
+    try:
+        return _sync_chains.strong.invoke(classification_input)
+    except Exception:
+        # A low-confidence fast answer beats no answer
+        if fast_result is not None:
+            return fast_result
+        raise
+
+
+async def _aroute_classification(
+    chains: ClassificationChains,
+    classification_input: Dict[str, Any],
+    est_tokens: int
+) -> Dict[str, Any]:
+    """Async _route_classification; each LLM call waits on the shared limiter."""
+    fast_result = None
+    try:
+        await _llm_limiter.acquire(est_tokens)
+        fast_result = await chains.fast.ainvoke(classification_input)
+        if not _needs_escalation(fast_result):
+            return fast_result
+    except Exception as e:
+        logger.debug(f"Fast classifier failed ({e}); escalating")
+    
+    try:
+        await _llm_limiter.acquire(est_tokens)
+        return await chains.strong.ainvoke(classification_input)
+    except Exception:
+        if fast_result is not None:
+            return fast_result
+        raise
+
+
+async def _aroute_group_classification(
+    chains: ClassificationChains,
+    items: List[Dict[str, Any]]
+) -> List[Dict[str, Any]]:
+    """
+    Grouped classification with the fast model; the whole group goes to the
+    strong model if the fast call fails, otherwise only its low-confidence items.
+    Each LLM call waits on the shared limiter.
+    """
+    group_input = _build_group_input(items)
+    try:
+        await _llm_limiter.acquire(_estimate_tokens([item.get("headline") for item in items]))
+        results = _unpack_group_result(
+            await chains.fast_batch.ainvoke(group_input), len(items)
+        )
+    except Exception as e:
+        logger.debug(f"Fast grouped classifier failed ({e}); escalating {len(items)} announcements")
+        await _llm_limiter.acquire(_estimate_tokens([item.get("headline") for item in items]))
+        return _unpack_group_result(await chains.strong_batch.ainvoke(group_input), len(items))
+    
+    low = [pos for pos, result in enumerate(results) if _needs_escalation(result)]
+    if low:
+        low_items = [items[pos] for pos in low]
+        try:
+            await _llm_limiter.acquire(_estimate_tokens([item.get("headline") for item in low_items]))
+            escalated = _unpack_group_result(
+                await chains.strong_batch.ainvoke(_build_group_input(low_items)), len(low)
+            )
+            for pos, result in zip(low, escalated):
+                results[pos] = result
+        except Exception as e:
+            logger.warning(f"Escalating {len(low)} low-confidence classifications failed: {e}")
+    return results
+
+
+def classify_announcements_batch(
+    items: List[Dict[str, Any]],
+    max_concurrency: Optional[int] = None,
+    group_size: int = CLASSIFY_GROUP_SIZE
+) -> List[Dict[str, Any]]:
+    """
+    Classify several announcements, packing up to group_size of them (within
+    CLASSIFY_GROUP_MAX_TOKENS) into each LLM call.
+    
+    Sync entry point to the pipeline's async path, so calls go through the same
+    rate limiter, retries and concurrency cap. Must not be called from a
+    running event loop.
+    
+    Args:
+        items: List of dicts with symbol, headline, event_date, category
+        max_concurrency: Maximum number of concurrent LLM calls
+            (defaults to LLM_MAX_CONCURRENCY)
+        group_size: Announcements per LLM call
+        
+    Returns:
+        List of classification dicts, in the same order as items. If a grouped
+        call fails, its announcements are classified one by one instead.
+    """
+    if not items:
+        return []
+    
+    return asyncio.run(
+        _classify_concurrently(items, max_concurrency or LLM_MAX_CONCURRENCY, group_size)
+    )
+
+
+@_retry_on_transient_error
+async def _ainvoke_classification_group(
+    chains: ClassificationChains,
+    items: List[Dict[str, Any]]
+) -> List[Dict[str, Any]]:
+    """Async cached classification of a group in one LLM call; raises on LLM errors."""
+    classifications, cache_keys, miss_indexes = _split_cached(items)
+    
+    if miss_indexes:
+        results = await _aroute_group_classification(chains, [items[idx] for idx in miss_indexes])
+        for idx, classification in zip(miss_indexes, results):
+            _classification_cache.set(cache_keys[idx], dict(classification))
+            classifications[idx] = classification
+    
+    return classifications
+
+
+async def _classify_group_safely(
+    chains: ClassificationChains,
+    group: List[Dict[str, Any]]
+) -> List[Dict[str, Any]]:
+    """Classify one group of announcements; never raises."""
+    try:
+        # Rate-limit retries happen inside, still holding this worker
+        return await _ainvoke_classification_group(chains, group)
+    except Exception as e:
+        symbols = ", ".join(str(ann.get("symbol")) for ann in group)
+        if _is_rate_limit_error(e):
+            logger.error(f"Error classifying {symbols}: {e}")
+            return [_default_classification(e) for _ in group]
+        logger.warning(f"Grouped classification failed for {symbols} ({e}); classifying individually")
+        return list(await asyncio.gather(
+            *(aclassify_announcement(chains, *_item_fields(ann)) for ann in group)
+        ))
+
+
+async def _classify_concurrently(
+    announcements: List[Dict[str, Any]],
+    max_concurrency: int = LLM_MAX_CONCURRENCY,
+    group_size: int = CLASSIFY_GROUP_SIZE
+) -> List[Dict[str, Any]]:
+    """
+    Classify announcements in groups with max_concurrency workers draining a
+    queue, so a slow group only holds up its own worker. Results keep the
+    input order.
+    
+    Runs on a fresh HTTP client: callers start a new event loop per run
+    (asyncio.run), and pooled connections can't outlive the loop that opened them.
+    """
+    groups = _group_by_budget([ann.get("headline") for ann in announcements], group_size)
+    classifications: List[Optional[Dict[str, Any]]] = [None] * len(announcements)
+    
+    queue: asyncio.Queue = asyncio.Queue()
+    for group in groups:
+        queue.put_nowait(group)
+    workers = min(max_concurrency, len(groups))
+    for _ in range(workers):
+        queue.put_nowait(None)  # one stop marker per worker
+    
+    async def worker(chains: ClassificationChains) -> None:
+        while (group := await queue.get()) is not None:
+            results = await _classify_group_safely(chains, [announcements[pos] for pos in group])
+            for pos, classification in zip(group, results):
+                classifications[pos] = classification
+    
+    async with httpx.AsyncClient(limits=GROQ_HTTP_LIMITS, timeout=GROQ_HTTP_TIMEOUT) as http_client:
+        chains = _build_classification_chains(http_client)
+        await asyncio.gather(*(worker(chains) for _ in range(workers)))
+    return classifications
 
 
 def filter_high_volatility_announcements(
@@ -220,8 +933,8 @@ def filter_high_volatility_announcements(
     """
     Filter announcements that are likely to cause high volatility.
     
-    First pre-filters by keywords to prioritize high-impact announcements,
-    then uses LLM to classify them.
+    First keeps the best announcement per symbol and pre-filters by keywords
+    to prioritize high-impact announcements, then uses LLM to classify them.
     
     Args:
         announcements: List of announcement dicts with symbol, headline, event_date, etc.
@@ -234,8 +947,9 @@ def filter_high_volatility_announcements(
     confidence_levels = {"low": 1, "medium": 2, "high": 3}
     min_level = confidence_levels.get(min_confidence, 2)
     
-    # Step 1: Pre-filter by keywords to prioritize high-impact announcements
-    pre_filtered = pre_filter_high_impact_announcements(
+    # Step 1: Keep the best announcement per symbol and pre-filter by keywords
+    # (one pass) to prioritize high-impact announcements
+    pre_filtered = select_top_unique_announcements(
         announcements, 
         max_results=max_classifications
     )
@@ -252,62 +966,39 @@ def filter_high_volatility_announcements(
     
     high_vol_announcements = []
     
-    announcements_to_process = pre_filtered
+    announcements_to_process = [
+        ann for ann in pre_filtered if ann.get("symbol") and ann.get("headline")
+    ]
+    
+    # Log the headlines being classified (first few for debugging)
+    for idx, ann in enumerate(announcements_to_process[:3]):
+        logger.info(f"[Sample {idx+1}] Classifying: {ann['symbol']} - {ann['headline'][:100]}...")
     
-    for idx, ann in enumerate(announcements_to_process):
+    cache_hits_before = _classification_cache.hits
+    cache_misses_before = _classification_cache.misses
+    
+    # Classify in groups of CLASSIFY_GROUP_SIZE per LLM call, with at most
+    # LLM_MAX_CONCURRENCY calls in flight
+    classifications = asyncio.run(_classify_concurrently(announcements_to_process))
+    
+    # (symbol, headline, classification) of the first TOP_RESULTS_LOG_SIZE
+    # classified announcements, for the results log below
+    classified_log = []
+    
+    for idx, (ann, classification) in enumerate(zip(announcements_to_process, classifications)):
         symbol = ann.get("symbol")
         headline = ann.get("headline")
-        event_date = ann.get("event_date")
-        category = ann.get("category")
-        
-        if not symbol or not headline:
-            continue
         
-        # Log the headline being classified (first few for debugging)
+        # Log full LLM response for first few (for debugging)
         if idx < 3:
-            logger.info(f"[Sample {idx+1}] Classifying: {symbol} - {headline[:100]}...")
-        
-        # Rate limiting: add delay between LLM calls to avoid hitting Groq limits
-        if idx > 0:  # Don't delay the first call
-            time.sleep(LLM_CALL_DELAY)
-        
-        # Classify using LLM
-        try:
-            classification = classify_announcement(
-                symbol=symbol,
-                headline=headline,
-                event_date=str(event_date) if event_date else "",
-                category=category,
+            logger.info(
+                f"[Sample {idx+1}] LLM Response for {symbol}:\n"
+                f"  Direction: {classification.get('ai_direction')}\n"
+                f"  Confidence: {classification.get('confidence')}\n"
+                f"  Event Type: {classification.get('event_type')}\n"
+                f"  Reaction Window: {classification.get('reaction_window')}\n"
+                f"  Explanation: {classification.get('explanation', '')[:150]}"
             )
-            
-            # Log full LLM response for first few (for debugging)
-            if idx < 3:
-                logger.info(
-                    f"[Sample {idx+1}] LLM Response for {symbol}:\n"
-                    f"  Direction: {classification.get('ai_direction')}\n"
-                    f"  Confidence: {classification.get('confidence')}\n"
-                    f"  Event Type: {classification.get('event_type')}\n"
-                    f"  Reaction Window: {classification.get('reaction_window')}\n"
-                    f"  Explanation: {classification.get('explanation', '')[:150]}"
-                )
-        except Exception as e:
-            # Handle rate limit errors gracefully
-            if "429" in str(e) or "rate limit" in str(e).lower():
-                logger.warning(f"Rate limit hit for {symbol}, waiting longer before retry...")
-                time.sleep(10)  # Wait 10 seconds on rate limit
-                try:
-                    classification = classify_announcement(
-                        symbol=symbol,
-                        headline=headline,
-                        event_date=str(event_date) if event_date else "",
-                        category=category,
-                    )
-                except Exception as retry_error:
-                    logger.error(f"Failed to classify {symbol} after retry: {retry_error}")
-                    continue
-            else:
-                logger.error(f"Error classifying {symbol}: {e}")
-                continue
         
         # Filter based on confidence and direction
         conf_level = confidence_levels.get(classification.get("confidence", "low"), 1)
@@ -317,6 +1008,8 @@ def filter_high_volatility_announcements(
         # ALWAYS store classification in announcement dict for logging (even if filtered out)
         classification["headline"] = headline  # Include headline in classification
         ann["classification"] = classification
+        if len(classified_log) < TOP_RESULTS_LOG_SIZE:
+            classified_log.append((symbol, headline, classification))
         
         # Include if:
         # 1. Confidence meets threshold
@@ -344,35 +1037,21 @@ def filter_high_volatility_announcements(
     logger.info(
         f"LLM Classification Summary: {total_classified} classified, "
         f"{len(high_vol_announcements)} passed filter "
-        f"(required: confidence>={min_confidence}, direction!=neutral)"
+        f"(required: confidence>={min_confidence}, direction!=neutral); "
+        f"cache {_classification_cache.hits - cache_hits_before} hits / "
+        f"{_classification_cache.misses - cache_misses_before} misses"
     )
     
-    # Log top 15 classification results (all classified announcements, not just filtered ones)
-    # Collect all classifications (including filtered out ones) for logging
-    all_classifications = []
-    for idx, ann in enumerate(announcements_to_process):
-        symbol = ann.get("symbol", "UNKNOWN")
-        headline = ann.get("headline", "")
-        # Get classification if it was added to the announcement
-        classification = ann.get("classification")
-        if classification:
-            all_classifications.append({
-                "symbol": symbol,
-                "headline": headline,
-                "classification": classification
-            })
-    
-    # Log top 15 classification results
-    top_n = min(15, len(all_classifications))
+    # Log top classification results (all classified announcements, not just filtered ones)
+    top_n = len(classified_log)
     if top_n > 0:
         logger.info(f"\n{'='*80}")
         logger.info(f"TOP {top_n} LLM CLASSIFICATION RESULTS:")
         logger.info(f"{'='*80}")
-        for idx, item in enumerate(all_classifications[:top_n], 1):
-            cls = item["classification"]
+        for idx, (symbol, headline, cls) in enumerate(classified_log, 1):
             logger.info(
-                f"\n[{idx}] {item['symbol']}\n"
-                f"  Headline: {item['headline'][:120]}...\n"
+                f"\n[{idx}] {symbol}\n"
+                f"  Headline: {headline[:120]}...\n"
                 f"  Direction: {cls.get('ai_direction', 'N/A')}\n"
                 f"  Confidence: {cls.get('confidence', 'N/A')}\n"
                 f"  Event Type: {cls.get('event_type', 'N/A')}\n"
@@ -391,187 +1070,3 @@ def filter_high_volatility_announcements(
         )
     
     return high_vol_announcements
-
-
-def deduplicate_announcements_by_symbol_pre_classification(
-    announcements: list[Dict[str, Any]]
-) -> list[Dict[str, Any]]:
-    """
-    Deduplicate announcements by symbol BEFORE classification.
-    Keeps only the best one per symbol based on headline/category keywords.
-    Prioritizes results and orders over other types.
-    
-    Args:
-        announcements: List of announcement dicts with symbol, headline, category (no classification yet)
-        
-    Returns:
-        Deduplicated list with one announcement per symbol
-    """
-    if not announcements:
-        return []
-    
-    # Group by symbol
-    by_symbol: Dict[str, List[Dict[str, Any]]] = {}
-    for ann in announcements:
-        symbol = ann.get("symbol")
-        if not symbol:
-            continue
-        symbol = symbol.upper()
-        if symbol not in by_symbol:
-            by_symbol[symbol] = []
-        by_symbol[symbol].append(ann)
-    
-    # For each symbol, pick the best announcement based on keywords
-    prioritized = []
-    
-    for symbol, anns in by_symbol.items():
-        if len(anns) == 1:
-            prioritized.append(anns[0])
-            continue
-        
-        # Score each announcement to pick the best one (based on keywords only, no classification yet)
-        best_ann = None
-        best_score = -1
-        
-        for ann in anns:
-            score = 0
-            headline = ann.get("headline", "").lower()
-            category = ann.get("category", "").lower() if ann.get("category") else ""
-            combined = f"{headline} {category}"
-            
-            # Prioritize results announcements
-            if any(kw in combined for kw in ["result", "quarter", "q1", "q2", "q3", "q4", "earnings", "financial"]):
-                score += 100
-            
-            # Prioritize orders/contracts
-            if any(kw in combined for kw in ["order", "contract", "tender", "award", "loi", "mou", "win", "bagged"]):
-                score += 80
-            
-            # Prioritize corporate actions
-            if any(kw in combined for kw in ["merger", "acquisition", "buyback", "dividend", "bonus", "split"]):
-                score += 60
-            
-            # Prioritize fund raising
-            if any(kw in combined for kw in ["fund raising", "qip", "fpo", "rights issue", "preferential"]):
-                score += 50
-            
-            # Boost score for certain categories
-            if "result" in category:
-                score += 50
-            elif "corp. action" in category or "corporate action" in category:
-                score += 40
-            elif "board meeting" in category:
-                score += 10
-            
-            if score > best_score:
-                best_score = score
-                best_ann = ann
-        
-        if best_ann:
-            prioritized.append(best_ann)
-            if len(anns) > 1:
-                logger.info(
-                    f"Pre-classification deduplication {symbol}: kept 1 announcement out of {len(anns)} "
-                    f"(selected: {best_ann.get('headline', '')[:60]}...)"
-                )
-    
-    logger.info(
-        f"Pre-classification deduplication: {len(announcements)} -> {len(prioritized)} "
-        f"({len(announcements) - len(prioritized)} duplicates removed)"
-    )
-    
-    return prioritized
-
-
-def deduplicate_announcements_by_symbol(
-    announcements: list[Dict[str, Any]]
-) -> list[Dict[str, Any]]:
-    """
-    Deduplicate announcements by symbol, keeping only the best one per symbol.
-    Prioritizes results and orders over other types.
-    
-    Args:
-        announcements: List of announcement dicts with symbol, classification, etc.
-        
-    Returns:
-        Deduplicated list with one announcement per symbol
-    """
-    if not announcements:
-        return []
-    
-    # Group by symbol
-    by_symbol: Dict[str, List[Dict[str, Any]]] = {}
-    for ann in announcements:
-        symbol = ann.get("symbol")
-        if not symbol:
-            continue
-        symbol = symbol.upper()
-        if symbol not in by_symbol:
-            by_symbol[symbol] = []
-        by_symbol[symbol].append(ann)
-    
-    # For each symbol, pick the best announcement
-    prioritized = []
-    
-    for symbol, anns in by_symbol.items():
-        if len(anns) == 1:
-            prioritized.append(anns[0])
-            continue
-        
-        # Score each announcement to pick the best one
-        best_ann = None
-        best_score = -1
-        
-        for ann in anns:
-            score = 0
-            classification = ann.get("classification", {})
-            headline = ann.get("headline", "").lower()
-            category = ann.get("category", "").lower() if ann.get("category") else ""
-            combined = f"{headline} {category}"
-            
-            # Prioritize results announcements
-            if any(kw in combined for kw in ["result", "quarter", "q1", "q2", "q3", "q4", "earnings", "financial"]):
-                score += 100
-            
-            # Prioritize orders/contracts
-            if any(kw in combined for kw in ["order", "contract", "tender", "award", "loi", "mou", "win", "bagged"]):
-                score += 80
-            
-            # Prioritize by event type
-            event_type = classification.get("event_type", "")
-            if event_type in ["results_positive", "results_negative"]:
-                score += 50
-            elif event_type in ["order_win", "order_loss"]:
-                score += 40
-            
-            # Prioritize by confidence
-            confidence = classification.get("confidence", "low")
-            if confidence == "high":
-                score += 20
-            elif confidence == "medium":
-                score += 10
-            
-            # Prioritize by direction (bullish/bearish over neutral)
-            direction = classification.get("ai_direction", "neutral")
-            if direction != "neutral":
-                score += 15
-            
-            if score > best_score:
-                best_score = score
-                best_ann = ann
-        
-        if best_ann:
-            prioritized.append(best_ann)
-            if len(anns) > 1:
-                logger.info(
-                    f"Deduplicated {symbol}: kept 1 announcement out of {len(anns)} "
-                    f"(selected: {best_ann.get('headline', '')[:60]}...)"
-                )
-    
-    logger.info(
-        f"Deduplicated announcements: {len(announcements)} -> {len(prioritized)} "
-        f"({len(announcements) - len(prioritized)} duplicates removed)"
-    )
-    
-    return prioritized
-
@@ -1,40 +1,71 @@
 """
 LangGraph workflow for BSE announcement scraping, classification, and stock research.
 """
+import heapq
+import logging
+import operator
+import sqlite3
+import threading
 from datetime import date
-from typing import Dict, Any, List, TypedDict, Optional
+from functools import lru_cache
+from pathlib import Path
+from typing import Annotated, Dict, Any, List, TypedDict, Optional
 from datetime import date
 
+from langchain_core.runnables import RunnableConfig
+from langgraph.checkpoint.sqlite import SqliteSaver
 from langgraph.graph import StateGraph, END
+from langgraph.types import Send
+from sqlalchemy import select
 from sqlalchemy.orm import Session
 
 from app.core.logging_utils import get_logger
-from app.services.bse_scraper import ingest_bse_announcements
-from app.services.announcement_classifier import (
-    filter_high_volatility_announcements,
-    deduplicate_announcements_by_symbol,
-    deduplicate_announcements_by_symbol_pre_classification,
-)
-from app.services.stock_researcher import research_multiple_stocks
 from app.db.models import BSEEvent
 
 logger = get_logger(__name__)
 
 
+# SQLite file holding checkpoints of interrupted pipeline runs
+WORKFLOW_CHECKPOINT_PATH = Path(__file__).resolve().parents[2] / "data" / "workflow_checkpoints.db"
+
+# Rows fetched per round trip when reading back scraped announcements
+SCRAPE_FETCH_BATCH_SIZE = 500
+
+# One lock per checkpoint thread (target date): concurrent runs for the same
+# date would resume / delete each other's checkpoints
+_run_locks: Dict[str, threading.Lock] = {}
+
+
 class WorkflowState(TypedDict):
-    """State for the announcement workflow."""
+    """
+    State for the announcement workflow.
+    
+    Nodes return only the keys they change; LangGraph merges them in.
+    """
     target_date: date
     announcements: List[Dict[str, Any]]
     high_vol_announcements: List[Dict[str, Any]]
+    # Per-announcement research results, appended by the parallel research tasks
+    researched: Annotated[List[Dict[str, Any]], operator.add]
     research_results: List[Dict[str, Any]]
-    errors: List[str]
+    # Trade-ready subset of research_results, same order
+    trade_recommendations: List[Dict[str, Any]]
     step: str
 
 
-def scrape_announcements(state: WorkflowState, db: Session) -> WorkflowState:
+class ResearchTask(TypedDict):
+    """Input of one parallel research task."""
+    announcement: Dict[str, Any]
+
+
+def scrape_announcements(state: WorkflowState, db: Session) -> Dict[str, Any]:
     """Step 1: Scrape BSE announcements."""
     logger.info(f"Step 1: Scraping BSE announcements for {state['target_date']}")
     
+    # Scraper, classifier and researcher (Playwright, LangChain, pandas) are
+    # imported on first use so importing this module stays cheap for the API
+    from app.services.bse_scraper import ingest_bse_announcements
+    
     try:
         # Scrape and ingest announcements
         inserted = ingest_bse_announcements(
@@ -47,24 +78,24 @@ def scrape_announcements(state: WorkflowState, db: Session) -> WorkflowState:
         from datetime import timedelta
         since = state["target_date"] - timedelta(days=2)
         
-        events = (
-            db.query(BSEEvent)
-            .filter(BSEEvent.event_date >= since)
-            .filter(BSEEvent.event_date <= state["target_date"])
+        # Only the columns the pipeline uses, straight into dicts (no ORM objects)
+        stmt = (
+            select(
+                BSEEvent.symbol,
+                BSEEvent.headline,
+                BSEEvent.event_date,
+                BSEEvent.url,
+                BSEEvent.category,
+                BSEEvent.source,
+            )
+            .where(BSEEvent.event_date >= since)
+            .where(BSEEvent.event_date <= state["target_date"])
             .order_by(BSEEvent.event_date.desc())
-            .all()
+            # Stream in batches (server-side cursor on Postgres) instead of
+            # buffering the whole window before building the dicts
+            .execution_options(yield_per=SCRAPE_FETCH_BATCH_SIZE)
         )
-        
-        announcements = []
-        for event in events:
-            announcements.append({
-                "symbol": event.symbol,
-                "headline": event.headline,
-                "event_date": event.event_date,
-                "url": event.url,
-                "category": event.category,
-                "source": event.source,
-            })
+        announcements = [dict(row) for row in db.execute(stmt).mappings()]
         
         logger.info(f"Found {len(announcements)} announcements")
         
@@ -73,35 +104,27 @@ def scrape_announcements(state: WorkflowState, db: Session) -> WorkflowState:
         # The symbol extraction might be imperfect, but since segment is Equity F&O,
         # all stocks have option chains by definition.
         
-        # Log unique symbols found
-        unique_symbols = set()
-        for ann in announcements:
-            symbol = ann.get("symbol")
-            if symbol:
-                unique_symbols.add(symbol.upper())
-        
-        logger.info(
-            f"Proceeding with {len(announcements)} announcements from {len(unique_symbols)} stocks "
-            f"(all are Equity F&O since segment filter was applied). "
-            f"Symbols: {', '.join(sorted(list(unique_symbols))[:20])}"
-        )
+        # Log unique symbols found (only built when INFO is enabled)
+        if logger.isEnabledFor(logging.INFO):
+            unique_symbols = {ann["symbol"].upper() for ann in announcements if ann.get("symbol")}
+            logger.info(
+                "Proceeding with %d announcements from %d stocks "
+                "(all are Equity F&O since segment filter was applied). Symbols: %s",
+                len(announcements), len(unique_symbols), ", ".join(heapq.nsmallest(20, unique_symbols)),
+            )
         
         return {
-            **state,
             "announcements": announcements,  # Use all announcements, no FNO filtering
             "step": "scraped",
         }
         
     except Exception as e:
+        # Raise so the run stops here and its checkpoint is kept for a resume
         logger.error(f"Error scraping announcements: {e}")
-        return {
-            **state,
-            "errors": state.get("errors", []) + [f"Scraping error: {str(e)}"],
-            "step": "error",
-        }
+        raise
 
 
-def classify_announcements(state: WorkflowState, max_classifications: int = 20) -> WorkflowState:
+def classify_announcements(state: WorkflowState, max_classifications: int = 20) -> Dict[str, Any]:
     """Step 2: Classify announcements for high volatility potential."""
     logger.info("Step 2: Classifying announcements for high volatility")
     
@@ -110,51 +133,68 @@ def classify_announcements(state: WorkflowState, max_classifications: int = 20)
     if not announcements:
         logger.warning("No announcements to classify")
         return {
-            **state,
             "high_vol_announcements": [],
             "step": "classified",
         }
     
+    from app.services.announcement_classifier import filter_high_volatility_announcements
+    
     try:
-        # Deduplicate BEFORE classification to avoid wasting LLM calls on duplicates
-        # Pick one announcement per symbol (preferring results/orders)
-        deduplicated = deduplicate_announcements_by_symbol_pre_classification(announcements)
-        
-        # Filter for high volatility announcements
+        # Filter for high volatility announcements; this deduplicates BEFORE
+        # classification (one announcement per symbol, preferring results/orders)
+        # to avoid wasting LLM calls on duplicates, so the result is already
+        # unique by symbol and needs no second dedup pass.
         # Limit classifications to avoid hitting Groq rate limits
         high_vol = filter_high_volatility_announcements(
-            announcements=deduplicated,
+            announcements=announcements,
             min_confidence="medium",
             max_classifications=max_classifications
         )
         
-        # Final deduplication after classification (in case classification changes priorities)
-        high_vol = deduplicate_announcements_by_symbol(high_vol)
-        
-        logger.info(f"Found {len(high_vol)} high-volatility announcements (after deduplication)")
+        logger.info(f"Found {len(high_vol)} high-volatility announcements (one per symbol)")
         
         return {
-            **state,
             "high_vol_announcements": high_vol,
             "step": "classified",
         }
         
     except Exception as e:
+        # Raise so the next run resumes here instead of re-scraping
         logger.error(f"Error classifying announcements: {e}")
-        return {
-            **state,
-            "errors": state.get("errors", []) + [f"Classification error: {str(e)}"],
-            "step": "error",
-        }
+        raise
 
 
-def research_stocks(state: WorkflowState, db: Session) -> WorkflowState:
-    """Step 3: Research stocks with high-volatility announcements."""
-    logger.info("Step 3: Researching stocks with announcements")
+def fan_out_research(state: WorkflowState):
+    """
+    Step 3a: Dispatch one research task per high-volatility announcement.
     
+    Tasks run in parallel (LangGraph runs the Send targets of a step
+    concurrently); with nothing to research, go straight to the report.
+    """
     high_vol = state.get("high_vol_announcements", [])
-    
     if not high_vol:
+        return "report"
+    
+    # Log which stocks will be researched
+    symbols_to_research = [ann.get("symbol", "UNKNOWN") for ann in high_vol]
+    logger.info(
+        f"Step 3: Researching {len(high_vol)} stocks with high-volatility announcements: "
+        f"{', '.join(sorted(set(symbols_to_research)))}"
+    )
+    return [Send("research_one", {"announcement": ann}) for ann in high_vol]
+
+
+def research_one(task: ResearchTask, db: Session) -> Dict[str, Any]:
+    """Step 3b: Research the stock behind one announcement, on its own DB session."""
+    from app.services.stock_researcher import research_announcement_in_new_session
+    
+    research = research_announcement_in_new_session(db, task["announcement"])
+    return {"researched": [research] if research is not None else []}
+
+
+def report_research(state: WorkflowState) -> Dict[str, Any]:
+    """Step 3c: Collect the parallel research results, ranked by confidence."""
+    if not state.get("high_vol_announcements"):
         logger.warning(
             "No high-volatility announcements to research. "
             "This could mean: 1) No announcements passed LLM classification filter, "
@@ -162,77 +202,72 @@ def research_stocks(state: WorkflowState, db: Session) -> WorkflowState:
             "3) No FNO stocks had high-impact announcements today."
         )
         return {
-            **state,
             "research_results": [],
+            "trade_recommendations": [],
             "step": "completed",
         }
     
-    # Log which stocks will be researched
-    symbols_to_research = [ann.get("symbol", "UNKNOWN") for ann in high_vol]
-    logger.info(
-        f"Researching {len(high_vol)} stocks with high-volatility announcements: "
-        f"{', '.join(sorted(set(symbols_to_research)))}"
-    )
+    from app.services.stock_researcher import sort_research_results
     
-    try:
-        # Research each stock
-        research_results = research_multiple_stocks(db=db, announcements=high_vol)
-        
-        # Filter to only trade-ready stocks (confidence >= 60, has liquidity)
-        trade_ready = [
-            r for r in research_results
-            if r.get("final_recommendation", {}).get("trade_ready", False)
-        ]
-        
-        # Log detailed research outcomes
-        logger.info(f"Researched {len(research_results)} stocks, {len(trade_ready)} are trade-ready")
-        
-        if research_results:
-            for result in research_results:
-                symbol = result.get("symbol", "UNKNOWN")
-                trade_ready_status = result.get("final_recommendation", {}).get("trade_ready", False)
-                confidence = result.get("final_recommendation", {}).get("confidence_score", 0)
-                reason = result.get("note", "No note")
-                
-                if not trade_ready_status:
-                    logger.info(
-                        f"  {symbol}: Not trade-ready (confidence: {confidence}, reason: {reason})"
-                    )
-                else:
-                    direction = result.get("final_recommendation", {}).get("direction", "unknown")
-                    logger.info(
-                        f"  {symbol}: ✓ Trade-ready (direction: {direction}, confidence: {confidence})"
-                    )
-        
-        if len(trade_ready) == 0 and len(research_results) > 0:
-            logger.warning(
-                f"Researched {len(research_results)} stocks but none are trade-ready. "
-                f"Common reasons: 1) Missing technical data, 2) Low options liquidity, "
-                f"3) Low confidence scores, 4) Data not ingested for these dates."
-            )
-        
-        return {
-            **state,
-            "research_results": research_results,
-            "step": "completed",
-        }
-        
-    except Exception as e:
-        logger.error(f"Error researching stocks: {e}")
-        return {
-            **state,
-            "errors": state.get("errors", []) + [f"Research error: {str(e)}"],
-            "step": "error",
-        }
+    research_results = sort_research_results(list(state.get("researched", [])))
+    
+    # Filter to only trade-ready stocks (confidence >= 60, has liquidity)
+    trade_ready = [
+        r for r in research_results
+        if r.get("final_recommendation", {}).get("trade_ready", False)
+    ]
+    
+    # Log detailed research outcomes
+    logger.info(f"Researched {len(research_results)} stocks, {len(trade_ready)} are trade-ready")
+    
+    if research_results:
+        for result in research_results:
+            symbol = result.get("symbol", "UNKNOWN")
+            trade_ready_status = result.get("final_recommendation", {}).get("trade_ready", False)
+            confidence = result.get("final_recommendation", {}).get("confidence_score", 0)
+            reason = result.get("note", "No note")
+            
+            if not trade_ready_status:
+                logger.info(
+                    f"  {symbol}: Not trade-ready (confidence: {confidence}, reason: {reason})"
+                )
+            else:
+                direction = result.get("final_recommendation", {}).get("direction", "unknown")
+                logger.info(
+                    f"  {symbol}: ✓ Trade-ready (direction: {direction}, confidence: {confidence})"
+                )
+    
+    if len(trade_ready) == 0 and len(research_results) > 0:
+        logger.warning(
+            f"Researched {len(research_results)} stocks but none are trade-ready. "
+            f"Common reasons: 1) Missing technical data, 2) Low options liquidity, "
+            f"3) Low confidence scores, 4) Data not ingested for these dates."
+        )
+    
+    return {
+        "research_results": research_results,
+        "trade_recommendations": trade_ready,
+        "step": "completed",
+    }
 
 
-def create_announcement_workflow(db: Session, max_classifications: int = 20) -> StateGraph:
+def _db(config: RunnableConfig) -> Session:
+    return config["configurable"]["db"]
+
+
+def _after_scrape(state: WorkflowState) -> str:
+    """Nothing scraped (holidays/weekends): skip classification and research."""
+    return "classify" if state.get("announcements") else END
+
+
+@lru_cache(maxsize=1)
+def create_announcement_workflow() -> StateGraph:
     """
     Create the LangGraph workflow for announcement processing.
     
-    Args:
-        db: Database session
-        
+    The graph is compiled once and reused; the database session and
+    max_classifications are passed per run in config["configurable"].
+    
     Returns:
         Compiled StateGraph workflow
     """
@@ -240,18 +275,32 @@ def create_announcement_workflow(db: Session, max_classifications: int = 20) ->
     workflow = StateGraph(WorkflowState)
     
     # Add nodes
-    workflow.add_node("scrape", lambda state: scrape_announcements(state, db))
-    workflow.add_node("classify", lambda state: classify_announcements(state, max_classifications))
-    workflow.add_node("research", lambda state: research_stocks(state, db))
+    workflow.add_node(
+        "scrape", lambda state, config: scrape_announcements(state, _db(config))
+    )
+    workflow.add_node(
+        "classify",
+        lambda state, config: classify_announcements(
+            state, config["configurable"].get("max_classifications", 20)
+        ),
+    )
+    workflow.add_node("research_one", lambda task, config: research_one(task, _db(config)))
+    workflow.add_node("report", report_research)
     
-    # Define the flow
+    # Define the flow: research fans out per announcement and joins at report
     workflow.set_entry_point("scrape")
-    workflow.add_edge("scrape", "classify")
-    workflow.add_edge("classify", "research")
-    workflow.add_edge("research", END)
+    workflow.add_conditional_edges("scrape", _after_scrape, ["classify", END])
+    workflow.add_conditional_edges("classify", fan_out_research, ["research_one", "report"])
+    workflow.add_edge("research_one", "report")
+    workflow.add_edge("report", END)
     
-    # Compile the workflow
-    app = workflow.compile()
+    # Compile the workflow; checkpoints let a failed run resume without
+    # re-scraping / re-classifying (see run_daily_announcement_pipeline).
+    # SqliteSaver serializes use of its connection with its own lock
+    checkpointer = SqliteSaver(
+        sqlite3.connect(WORKFLOW_CHECKPOINT_PATH, check_same_thread=False)
+    )
+    app = workflow.compile(checkpointer=checkpointer)
     
     return app
 
@@ -280,29 +329,49 @@ def run_daily_announcement_pipeline(
     
     logger.info(f"Running daily announcement pipeline for {target_date}")
     
-    # Create workflow
-    app = create_announcement_workflow(db, max_classifications=max_classifications)
+    from app.services.stock_researcher import RESEARCH_MAX_CONCURRENCY
+    
+    # Compiled once per process
+    app = create_announcement_workflow()
     
     # Initial state
     initial_state: WorkflowState = {
         "target_date": target_date,
         "announcements": [],
         "high_vol_announcements": [],
+        "researched": [],
         "research_results": [],
-        "errors": [],
+        "trade_recommendations": [],
         "step": "started",
     }
     
+    # One checkpoint thread per date. Nodes raise on failure, so checkpoints
+    # only outlive a failed run and the next run for that date picks up at
+    # the failed node.
+    thread_id = str(target_date)
+    config = {
+        "max_concurrency": RESEARCH_MAX_CONCURRENCY,
+        "configurable": {
+            "thread_id": thread_id,
+            "db": db,
+            "max_classifications": max_classifications,
+        },
+    }
+    
     # Run workflow
     try:
-        final_state = app.invoke(initial_state)
+        with _run_locks.setdefault(thread_id, threading.Lock()):
+            pending = app.get_state(config).next
+            if pending:
+                logger.info(f"Resuming failed pipeline run for {target_date} at {', '.join(pending)}")
+                final_state = app.invoke(None, config=config)
+            else:
+                app.checkpointer.delete_thread(thread_id)
+                final_state = app.invoke(initial_state, config=config)
+            app.checkpointer.delete_thread(thread_id)
         
-        # Extract trade-ready recommendations
         research_results = final_state.get("research_results", [])
-        trade_recommendations = [
-            r for r in research_results
-            if r.get("final_recommendation", {}).get("trade_ready", False)
-        ]
+        trade_recommendations = final_state.get("trade_recommendations", [])
         
         return {
             "target_date": target_date,
@@ -310,7 +379,7 @@ def run_daily_announcement_pipeline(
             "high_vol_announcements": final_state.get("high_vol_announcements", []),
             "research_results": research_results,
             "trade_recommendations": trade_recommendations,
-            "errors": final_state.get("errors", []),
+            "errors": [],
             "summary": {
                 "total_announcements": len(final_state.get("announcements", [])),
                 "high_vol_count": len(final_state.get("high_vol_announcements", [])),
@@ -324,6 +393,7 @@ def run_daily_announcement_pipeline(
         return {
             "target_date": target_date,
             "error": str(e),
+            "errors": [str(e)],
             "announcements": [],
             "high_vol_announcements": [],
             "research_results": [],
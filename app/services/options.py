@@ -1,8 +1,8 @@
 from datetime import date
-from typing import Optional, Dict, Any
+from typing import Optional, Dict, Any, List
 
 from sqlalchemy.orm import Session
-from sqlalchemy import func, and_
+from sqlalchemy import func, and_, select
 
 from app.db.models import OptionChain, DailyPrice
 
@@ -94,3 +94,84 @@ def get_options_liquidity(
         "total_oi": total_oi,
         "total_volume": total_volume,
     }
+
+
+def get_options_liquidity_bulk(
+    db: Session,
+    symbols: List[str],
+    trade_date: date,
+    moneyness_band: float = 0.1,
+) -> Dict[str, Dict[str, Any]]:
+    """
+    Same metric as get_options_liquidity, but for many symbols in a single
+    aggregate query instead of three round-trips per symbol.
+
+    Returns {symbol: {symbol, date, spot, expiry, total_oi, total_volume}}.
+    Symbols without spot, expiry or any OI/volume in the band are omitted.
+    """
+    if not symbols:
+        return {}
+
+    spot_sq = (
+        select(DailyPrice.symbol, DailyPrice.close.label("spot"))
+        .where(
+            DailyPrice.symbol.in_(symbols),
+            DailyPrice.date == trade_date,
+            DailyPrice.close > 0,
+        )
+        .subquery()
+    )
+
+    expiry_sq = (
+        select(OptionChain.symbol, func.min(OptionChain.expiry).label("expiry"))
+        .where(
+            OptionChain.symbol.in_(symbols),
+            OptionChain.date == trade_date,
+            OptionChain.expiry >= trade_date,
+        )
+        .group_by(OptionChain.symbol)
+        .subquery()
+    )
+
+    stmt = (
+        select(
+            spot_sq.c.symbol,
+            spot_sq.c.spot,
+            expiry_sq.c.expiry,
+            func.coalesce(func.sum(OptionChain.oi), 0.0).label("total_oi"),
+            func.coalesce(func.sum(OptionChain.volume), 0.0).label("total_volume"),
+        )
+        .select_from(spot_sq)
+        .join(expiry_sq, expiry_sq.c.symbol == spot_sq.c.symbol)
+        .join(
+            OptionChain,
+            and_(
+                OptionChain.symbol == spot_sq.c.symbol,
+                OptionChain.date == trade_date,
+                OptionChain.expiry == expiry_sq.c.expiry,
+                OptionChain.strike >= spot_sq.c.spot * (1.0 - moneyness_band),
+                OptionChain.strike <= spot_sq.c.spot * (1.0 + moneyness_band),
+            ),
+        )
+        .group_by(spot_sq.c.symbol, spot_sq.c.spot, expiry_sq.c.expiry)
+    )
+
+    out: Dict[str, Dict[str, Any]] = {}
+    for row in db.execute(stmt):
+        total_oi = float(row.total_oi)
+        total_volume = float(row.total_volume)
+
+        # Completely dead -> treat like no liquidity
+        if total_oi == 0.0 and total_volume == 0.0:
+            continue
+
+        out[row.symbol] = {
+            "symbol": row.symbol,
+            "date": trade_date,
+            "spot": float(row.spot),
+            "expiry": row.expiry,
+            "total_oi": total_oi,
+            "total_volume": total_volume,
+        }
+
+    return out
@@ -0,0 +1,57 @@
+"""
+Rolling-window rate limiter for LLM calls (requests/min and tokens/min).
+"""
+import asyncio
+import threading
+import time
+from collections import deque
+from typing import Deque, Tuple
+
+
+class RollingWindowLimiter:
+    """
+    Async limiter enforcing request and token budgets over a rolling window.
+
+    Calls only wait when the current window is actually full, instead of being
+    spaced by a fixed worst-case delay. Bookkeeping is guarded by a thread lock
+    (not an asyncio one) so a module-level limiter works across asyncio.run()
+    calls and threads.
+    """
+
+    def __init__(self, rpm_limit: int, tpm_limit: int, window_seconds: float = 60.0):
+        self.rpm_limit = rpm_limit
+        self.tpm_limit = tpm_limit
+        self.window_seconds = window_seconds
+        self._calls: Deque[Tuple[float, int]] = deque()  # (timestamp, tokens)
+        self._tokens_in_window = 0
+        self._lock = threading.Lock()
+
+    def _try_acquire(self, est_tokens: int) -> float:
+        """Record the call and return 0 if it fits, else the seconds to wait."""
+        # A single call larger than the whole budget still goes through on an empty window
+        tokens = min(est_tokens, self.tpm_limit)
+        with self._lock:
+            now = time.monotonic()
+            cutoff = now - self.window_seconds
+            while self._calls and self._calls[0][0] <= cutoff:
+                _, expired = self._calls.popleft()
+                self._tokens_in_window -= expired
+
+            if (
+                len(self._calls) < self.rpm_limit
+                and self._tokens_in_window + tokens <= self.tpm_limit
+            ):
+                self._calls.append((now, tokens))
+                self._tokens_in_window += tokens
+                return 0.0
+
+            # Wait until the oldest call leaves the window, then re-check
+            return max(self._calls[0][0] + self.window_seconds - now, 0.01)
+
+    async def acquire(self, est_tokens: int = 0) -> None:
+        """Wait until a call estimated at est_tokens fits in the window."""
+        while True:
+            wait = self._try_acquire(est_tokens)
+            if not wait:
+                return
+            await asyncio.sleep(wait)
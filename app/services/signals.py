@@ -1,5 +1,6 @@
+import heapq
 from datetime import date, timedelta
-from typing import List, Dict, Any
+from typing import List, Dict, Any, Optional
 
 import pandas as pd
 from sqlalchemy.orm import Session
@@ -17,13 +18,16 @@ def get_price_history(
     symbol: str,
     end_date: date,
     lookback_days: int = LOOKBACK_DAYS_DEFAULT,
+    start_date: Optional[date] = None,
 ) -> pd.DataFrame:
     """
     Load recent price history for a symbol up to end_date (inclusive)
     and return as a pandas DataFrame sorted by date.
+    start_date, if given, overrides the lookback window.
     """
-    # small buffer for weekends/holidays
-    start_date = end_date - timedelta(days=lookback_days * 2)
+    if start_date is None:
+        # small buffer for weekends/holidays
+        start_date = end_date - timedelta(days=lookback_days * 2)
 
     stmt = (
         select(DailyPrice)
@@ -148,6 +152,41 @@ def score_symbol_for_date(
     Returns dict with metrics, or None if there is no data at all.
     """
     df = get_price_history(db, symbol, target_date, lookback_days=lookback_days)
+    return _score_history(df, symbol, target_date)
+
+
+def score_symbol_for_latest_date(
+    db: Session,
+    symbol: str,
+    end_date: date,
+    max_days_back: int,
+    lookback_days: int = LOOKBACK_DAYS_DEFAULT,
+) -> Dict[str, Any] | None:
+    """
+    score_symbol_for_date for the latest date in
+    [end_date - max_days_back, end_date] that has a price row.
+    Loads the price history once instead of once per candidate date.
+    """
+    earliest = end_date - timedelta(days=max_days_back)
+    history = get_price_history(
+        db, symbol, end_date, start_date=earliest - timedelta(days=lookback_days * 2)
+    )
+    if history.empty:
+        return None
+
+    in_window = history["date"][history["date"] >= earliest]
+    if in_window.empty:
+        return None
+
+    # Same rows score_symbol_for_date would load for that date
+    target_date = in_window.iloc[-1]
+    start_date = target_date - timedelta(days=lookback_days * 2)
+    df = history[history["date"] >= start_date].reset_index(drop=True)
+    return _score_history(df, symbol, target_date)
+
+
+def _score_history(df: pd.DataFrame, symbol: str, target_date: date) -> Dict[str, Any] | None:
+    """Metrics for target_date from a price history ending on or after it."""
     if df.empty:
         return None
 
@@ -178,7 +217,8 @@ def score_all_symbols_for_date(
     limit: int = 50,
 ) -> List[Dict[str, Any]]:
     """
-    Score all symbols in stocks table for a given date, return top N.
+    Score all symbols in stocks table for a given date, return top N
+    sorted by score (highest first).
     """
     symbols = db.scalars(select(Stock.symbol)).all()
     results: List[Dict[str, Any]] = []
@@ -191,5 +231,5 @@ def score_all_symbols_for_date(
             # even if score is 0, include it; we'll sort anyway
             results.append(metrics)
 
-    results.sort(key=lambda x: x["score"], reverse=True)
-    return results[:limit]
+    # Top-N selection without sorting the whole list
+    return heapq.nlargest(limit, results, key=lambda x: x["score"])
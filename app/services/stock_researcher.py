@@ -7,13 +7,17 @@ from typing import Dict, Any, Optional, List
 from sqlalchemy.orm import Session
 
 from app.core.logging_utils import get_logger
-from app.services.signals import score_symbol_for_date, get_price_history
+from app.db.sessions import SessionLocal
+from app.services.signals import score_symbol_for_latest_date
 from app.services.options import get_options_liquidity
-from app.services.universe import get_fno_symbols
+from app.services.universe import get_fno_symbol_set
 from app.candidate.candidate_access import classify_direction_and_strategy
 
 logger = get_logger(__name__)
 
+# Stocks researched at once (each holds one DB connection while it runs)
+RESEARCH_MAX_CONCURRENCY = 8
+
 
 def research_stock_with_announcement(
     db: Session,
@@ -41,8 +45,7 @@ def research_stock_with_announcement(
     logger.info(f"Researching {symbol_upper} for announcement on {announcement_date}")
     
     # Check if stock is in FNO universe
-    fno_symbols = get_fno_symbols()
-    if symbol_upper not in fno_symbols:
+    if symbol_upper not in get_fno_symbol_set():
         logger.warning(
             f"{symbol_upper} is not in FNO universe - skipping technical research. "
             f"Announcement may still be valid but options trading not available."
@@ -81,20 +84,12 @@ def research_stock_with_announcement(
             "note": "Stock not in FNO universe - options trading not available",
         }
     
-    # Get technical metrics for the announcement date
-    # Try multiple dates: announcement date, then previous days (up to 5 days back)
-    metrics = None
-    used_date = None
-    from datetime import timedelta
-    
-    for days_back in range(6):  # Try 0 to 5 days back
-        try_date = announcement_date - timedelta(days=days_back)
-        metrics = score_symbol_for_date(db, symbol_upper, try_date)
-        if metrics:
-            used_date = try_date
-            if days_back > 0:
-                logger.info(f"Using data from {try_date} ({(announcement_date - try_date).days} days before announcement) for {symbol_upper}")
-            break
+    # Get technical metrics for the announcement date, or the latest trading
+    # day up to 5 days before it (one price query for the whole range)
+    metrics = score_symbol_for_latest_date(db, symbol_upper, announcement_date, max_days_back=5)
+    used_date = metrics["date"] if metrics else None
+    if used_date and used_date != announcement_date:
+        logger.info(f"Using data from {used_date} ({(announcement_date - used_date).days} days before announcement) for {symbol_upper}")
     
     # If still no metrics, return basic research with just announcement data
     if not metrics:
@@ -151,13 +146,6 @@ def research_stock_with_announcement(
         if liquidity:
             break
     
-    # Get price history for context - use used_date if available
-    price_history = get_price_history(
-        db, symbol_upper, 
-        used_date if used_date else announcement_date, 
-        lookback_days=10
-    )
-    
     # Classify direction based on technicals
     direction, strategy_hint = classify_direction_and_strategy(metrics)
     
@@ -280,44 +268,54 @@ def _generate_strategy_recommendation(
             return f"Bear put spread ({timing}) - buy ATM put, sell OTM put to reduce cost"
 
 
-def research_multiple_stocks(
+def research_announcement(
     db: Session,
-    announcements: List[Dict[str, Any]]
-) -> List[Dict[str, Any]]:
+    ann: Dict[str, Any]
+) -> Optional[Dict[str, Any]]:
     """
-    Research multiple stocks with announcements.
+    Research the stock behind one announcement.
     
     Args:
         db: Database session
-        announcements: List of announcement dicts with symbol, event_date, classification
+        ann: Announcement dict with symbol, event_date, classification
         
     Returns:
-        List of research results, sorted by confidence score
+        Research result, or None if the announcement lacks symbol/date or research fails
     """
-    results = []
+    symbol = ann.get("symbol")
+    event_date = ann.get("event_date")
+    classification = ann.get("classification", {})
     
-    for ann in announcements:
-        symbol = ann.get("symbol")
-        event_date = ann.get("event_date")
-        classification = ann.get("classification", {})
-        
-        if not symbol or not event_date:
-            continue
-        
-        try:
-            research = research_stock_with_announcement(
-                db, symbol, event_date, classification
-            )
-            results.append(research)
-        except Exception as e:
-            logger.error(f"Error researching {symbol}: {e}")
-            continue
+    if not symbol or not event_date:
+        return None
+    
+    try:
+        return research_stock_with_announcement(
+            db, symbol, event_date, classification
+        )
+    except Exception as e:
+        logger.error(f"Error researching {symbol}: {e}")
+        return None
+
+
+def research_announcement_in_new_session(
+    db: Session,
+    ann: Dict[str, Any]
+) -> Optional[Dict[str, Any]]:
+    """
+    research_announcement on a fresh session bound to db's engine.
     
-    # Sort by confidence score (highest first)
+    Sessions aren't safe to share between threads, so parallel research
+    tasks each get their own (and their own pooled connection).
+    """
+    with SessionLocal(bind=db.get_bind()) as task_db:
+        return research_announcement(task_db, ann)
+
+
+def sort_research_results(results: List[Dict[str, Any]]) -> List[Dict[str, Any]]:
+    """Sort research results by confidence score (highest first), in place."""
     results.sort(
         key=lambda x: x.get("final_recommendation", {}).get("confidence_score", 0),
         reverse=True
     )
-    
     return results
-
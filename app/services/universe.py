@@ -1,4 +1,6 @@
+from functools import lru_cache
 from pathlib import Path
+from typing import FrozenSet
 import pandas as pd
 
 BASE_DIR = Path(__file__).resolve().parents[2]
@@ -12,3 +14,13 @@ def get_fno_universe():
 
 def get_fno_symbols():
     return get_fno_universe()["symbol"].tolist()
+
+
+@lru_cache(maxsize=1)
+def _fno_symbol_set(mtime: float) -> FrozenSet[str]:
+    return frozenset(str(s).upper() for s in get_fno_symbols())
+
+
+def get_fno_symbol_set() -> FrozenSet[str]:
+    """Uppercased FNO symbols; cached until fno_universe.csv changes on disk."""
+    return _fno_symbol_set(FNO_PATH.stat().st_mtime)
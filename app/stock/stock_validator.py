@@ -16,6 +16,16 @@ class StockOut(StockBase):
     class Config:
         from_attributes = True  
 
+    @classmethod
+    def from_orm_fast(cls, row: Any) -> "StockOut":
+        """Build from a trusted Stock ORM row without re-validating."""
+        return cls.model_construct(
+            id=row.id,
+            symbol=row.symbol,
+            name=row.name,
+            segment=row.segment,
+        )
+
 
 class DailyCandidateOut(BaseModel):
     symbol: str
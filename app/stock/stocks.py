@@ -11,4 +11,4 @@ router = APIRouter(prefix="/stocks", tags=["stocks"])
 @router.get("/", response_model=list[StockOut])
 def list_stocks(db: Session = Depends(get_db)):
     stocks = get_all_stocks(db)
-    return stocks
+    return [StockOut.from_orm_fast(s) for s in stocks]
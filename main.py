@@ -1,12 +1,22 @@
+from contextlib import asynccontextmanager
+
 from fastapi import FastAPI
 
+from app.core.http_clients import groq_http_async_client
 from app.candidate import candidate
 from app.news import news
 from app.stock import stocks
 from app.ai import ai_router
 from app.announcements import announcements
 
-app = FastAPI()
+@asynccontextmanager
+async def lifespan(app: FastAPI):
+    yield
+    # Opened on this event loop by the AI endpoints, so close it on it too
+    await groq_http_async_client.aclose()
+
+
+app = FastAPI(lifespan=lifespan)
 
 @app.get("/health")
 async def health():
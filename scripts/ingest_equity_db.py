@@ -51,8 +51,10 @@ def ingest_bhavcopy(filepath: Path, trade_date_str: str):
         inserted_prices = 0
         inserted_stocks = 0
 
-        for _, row in df.iterrows():
-            symbol = row["SYMBOL"]
+        price_cols = ["SYMBOL", "OPEN_PRICE", "HIGH_PRICE", "LOW_PRICE", "CLOSE_PRICE", "TTL_TRD_QNTY"]
+        for symbol, open_raw, high_raw, low_raw, close_raw, volume_raw in df[price_cols].itertuples(
+            index=False, name=None
+        ):
 
             # 🔹 If symbol not present in stocks, add it
             if symbol not in existing_symbols:
@@ -65,11 +67,11 @@ def ingest_bhavcopy(filepath: Path, trade_date_str: str):
                 existing_symbols.add(symbol)
                 inserted_stocks += 1
 
-            open_price = float(row["OPEN_PRICE"])
-            high_price = float(row["HIGH_PRICE"])
-            low_price = float(row["LOW_PRICE"])
-            close_price = float(row["CLOSE_PRICE"])
-            volume = float(row["TTL_TRD_QNTY"])
+            open_price = float(open_raw)
+            high_price = float(high_raw)
+            low_price = float(low_raw)
+            close_price = float(close_raw)
+            volume = float(volume_raw)
 
             # Idempotent insert into daily_prices
             existing_price = (
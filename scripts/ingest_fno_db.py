@@ -143,16 +143,11 @@ def ingest_fno_file(filepath: Path, trade_date_str: Optional[str] = None):
     try:
         inserted = 0
 
-        for _, row in df.iterrows():
-            underlying = str(row["underlying"])
-            symbol = auto_add_stock_if_missing(db, underlying)
-
-            expiry = row["expiry"]
-            strike = row["strike"]
-            opt_type = row["option_type"]
-            ltp = row["ltp"]
-            oi = row["oi"]
-            volume = row["contracts_traded"]
+        row_cols = ["underlying", "expiry", "strike", "option_type", "ltp", "oi", "contracts_traded"]
+        for underlying, expiry, strike, opt_type, ltp, oi, volume in df[row_cols].itertuples(
+            index=False, name=None
+        ):
+            symbol = auto_add_stock_if_missing(db, str(underlying))
 
             # Optional: skip completely dead contracts
             # if (oi is None or oi == 0) and (volume is None or volume == 0):